@@ -1,7 +1,9 @@
 """Shared mock objects and session factories for wafer tests."""
 
 import asyncio
+import functools
 import json
+import types
 from urllib.parse import urlparse
 
 from wafer._base import (
@@ -31,6 +33,37 @@ class MockStatus:
         return 200 <= self._code < 300
 
 
+@functools.lru_cache(maxsize=512)
+def _encode_headers(
+    items: tuple[tuple[str, str | tuple[str, ...]], ...],
+) -> tuple[tuple[bytes, tuple[bytes, ...]], ...]:
+    """Encode a hashable header spec into (bytes key, bytes values) pairs.
+
+    Tests build the same handful of header dicts thousands of times, so
+    the lower/encode work is memoized. Returns immutable tuples; callers
+    copy into their own lists because tests mutate ``_raw`` in place.
+    """
+    raw: dict[bytes, list[bytes]] = {}
+    for k, v in items:
+        values = v if isinstance(v, tuple) else (v,)
+        raw.setdefault(k.lower().encode("ascii"), []).extend(
+            value.encode("utf-8") for value in values
+        )
+    return tuple((k, tuple(v)) for k, v in raw.items())
+
+
+# str header name -> lowercased bytes key; tests look up the same few
+# names (content-type, set-cookie, location) over and over.
+_HEADER_KEY_CACHE: dict[str, bytes] = {}
+
+
+def _header_key(key: str) -> bytes:
+    bk = _HEADER_KEY_CACHE.get(key)
+    if bk is None:
+        bk = _HEADER_KEY_CACHE[key] = key.lower().encode("ascii")
+    return bk
+
+
 class MockHeaderMap:
     """Mock wreq HeaderMap with bytes keys and bytes values.
 
@@ -44,22 +77,20 @@ class MockHeaderMap:
         self,
         data: dict[str, str | list[str]] | None = None,
     ):
-        self._raw: dict[bytes, list[bytes]] = {}
-        for k, v in (data or {}).items():
-            bk = k.lower().encode("ascii")
-            if bk not in self._raw:
-                self._raw[bk] = []
-            values = v if isinstance(v, list) else [v]
-            self._raw[bk].extend(
-                value.encode("utf-8") for value in values
-            )
+        items = tuple(
+            (k, tuple(v) if isinstance(v, list) else v)
+            for k, v in (data or {}).items()
+        )
+        self._raw: dict[bytes, list[bytes]] = {
+            k: list(v) for k, v in _encode_headers(items)
+        }
 
     def keys(self):
         return list(self._raw.keys())
 
     def __getitem__(self, key):
         if isinstance(key, str):
-            key = key.lower().encode("ascii")
+            key = _header_key(key)
         return self._raw[key][0]
 
     def get(self, key):
@@ -70,7 +101,7 @@ class MockHeaderMap:
 
     def get_all(self, key):
         if isinstance(key, str):
-            key = key.lower().encode("ascii")
+            key = _header_key(key)
         return list(self._raw.get(key, []))
 
 
@@ -121,6 +152,8 @@ class MockResponse:
         self.status = MockStatus(status_code)
         self.headers = MockHeaderMap(headers)
         self._body = body
+        # Encoded once: the retry loop reads bytes()/stream() per attempt.
+        self._content = body.encode("utf-8")
         # Declared Content-Length for the response-size-cap short-circuit.
         # None (default) = no declared length, so the cap (if any) falls
         # through to the streamed read - matching chunked responses.
@@ -130,10 +163,10 @@ class MockResponse:
         return self._body
 
     def bytes(self):
-        return self._body.encode("utf-8")
+        return self._content
 
     def stream(self):
-        return _MockStreamer(self._body.encode("utf-8"))
+        return _MockStreamer(self._content)
 
     def json(self):
         return json.loads(self._body)
@@ -152,16 +185,32 @@ class AsyncMockResponse:
         self.status = MockStatus(status_code)
         self.headers = MockHeaderMap(headers)
         self._body = body
+        self._content = body.encode("utf-8")
         self.content_length = content_length
 
+    @classmethod
+    def from_sync(cls, resp: "MockResponse") -> "AsyncMockResponse":
+        """Build from a MockResponse, copying its already-encoded headers.
+
+        Skips the bytes -> str -> bytes round trip through MockHeaderMap
+        while preserving repeated values (especially Set-Cookie).
+        """
+        new = cls(
+            resp.status.as_int(),
+            body=resp._body,
+            content_length=resp.content_length,
+        )
+        new.headers._raw = {k: list(v) for k, v in resp.headers._raw.items()}
+        return new
+
     async def text(self):
         return self._body
 
     async def bytes(self):
-        return self._body.encode("utf-8")
+        return self._content
 
     def stream(self):
-        return _MockStreamer(self._body.encode("utf-8"))
+        return _MockStreamer(self._content)
 
     def json(self):
         return json.loads(self._body)
@@ -176,12 +225,30 @@ class MockCookie:
         self.secure = secure
 
 
+class MockBrowser:
+    """Connected-browser stand-in for solver tests that never drive it.
+
+    Slotted and attribute-free so unexpected use fails loudly instead of
+    returning a child MagicMock.
+    """
+
+    __slots__ = ("_connected",)
+
+    def __init__(self, connected: bool = True):
+        self._connected = connected
+
+    def is_connected(self) -> bool:
+        return self._connected
+
+
 class MockJar:
     """Small wreq-like jar that records and resolves cookies."""
 
     def __init__(self):
         self.added = []
         self._cookies: dict[tuple[str, str, str], MockCookie] = {}
+        # name -> {(domain, path): cookie}, so get() skips unrelated names
+        self._by_name: dict[str, dict[tuple[str, str], MockCookie]] = {}
 
     def add(self, cookie_str, url):
         self.added.append((cookie_str, url))
@@ -202,9 +269,9 @@ class MockJar:
                 path = attr_value.strip() or "/"
             elif attr == "secure":
                 secure = True
-        self._cookies[(domain, path, name)] = MockCookie(
-            name, value, domain, path, secure
-        )
+        cookie = MockCookie(name, value, domain, path, secure)
+        self._cookies[(domain, path, name)] = cookie
+        self._by_name.setdefault(name, {})[(domain, path)] = cookie
 
     def get(self, name, url):
         parsed = urlparse(url)
@@ -212,9 +279,8 @@ class MockJar:
         request_path = parsed.path or "/"
         candidates = [
             cookie
-            for (_, _, cookie_name), cookie in self._cookies.items()
-            if cookie_name == name
-            and (
+            for cookie in self._by_name.get(name, {}).values()
+            if (
                 host == cookie.domain
                 or host.endswith("." + cookie.domain)
             )
@@ -324,20 +390,7 @@ def to_async_responses(responses):
         if isinstance(r, (Exception, AsyncMockResponse)):
             result.append(r)
         else:
-            # Preserve repeated header values, especially Set-Cookie.
-            headers = {}
-            for bk, vals in r.headers._raw.items():
-                headers[bk.decode()] = [
-                    value.decode() for value in vals
-                ]
-            result.append(
-                AsyncMockResponse(
-                    r.status.as_int(),
-                    headers,
-                    r._body,
-                    content_length=r.content_length,
-                )
-            )
+            result.append(AsyncMockResponse.from_sync(r))
     return result
 
 
@@ -345,23 +398,41 @@ def to_async_responses(responses):
 # Session factories
 # ---------------------------------------------------------------------------
 
+# Sessions only ever replace .headers / ._chrome_headers wholesale, so
+# mock sessions share one read-only view of the defaults instead of
+# copying them per factory call. A test that mutates in place gets a
+# TypeError rather than silently leaking into the next test.
+_DEFAULT_HEADERS_PROXY = types.MappingProxyType(DEFAULT_HEADERS)
 
-def make_sync_session(responses, **session_kwargs):
-    """Create a SyncSession with a mocked client.
+# A fresh Chrome-profile session's client headers depend only on its embed
+# mode, so each variant is computed once and every session gets a copy.
+# FingerprintManager stays per-session: rotation and pinning mutate it.
+_CLIENT_HEADERS_CACHE: dict[str | None, dict[str, str]] = {}
 
-    All BaseSession attributes are defaulted. Override via session_kwargs:
+
+def _initial_client_headers(session):
+    if session._profile is not None:
+        return session._compute_client_headers()
+    cached = _CLIENT_HEADERS_CACHE.get(session._embed)
+    if cached is None:
+        cached = session._compute_client_headers()
+        _CLIENT_HEADERS_CACHE[session._embed] = cached
+    return dict(cached)
+
+
+
+def _init_base_session(session, session_kwargs):
+    """Default every BaseSession attribute shared by both session kinds.
+
+    Overrides come from session_kwargs:
     - max_retries, max_rotations, max_failures
     - follow_redirects, max_redirects
     - embed_origin, embed_referers
     - browser_solver
     - cookie_cache, rate_limiter
     """
-    from wafer._sync import SyncSession
-
-    session = SyncSession.__new__(SyncSession)
-
-    session.headers = dict(DEFAULT_HEADERS)
-    session._chrome_headers = dict(DEFAULT_HEADERS)
+    session.headers = _DEFAULT_HEADERS_PROXY
+    session._chrome_headers = _DEFAULT_HEADERS_PROXY
     session._user_headers = False
 
     session.connect_timeout = DEFAULT_CONNECT_TIMEOUT
@@ -445,7 +516,19 @@ def make_sync_session(responses, **session_kwargs):
         session._chrome_headers = None
         session._fingerprint = None
 
-    session._client_headers = session._compute_client_headers()
+    session._client_headers = _initial_client_headers(session)
+
+
+def make_sync_session(responses, **session_kwargs):
+    """Create a SyncSession with a mocked client.
+
+    All BaseSession attributes are defaulted; see _init_base_session for
+    the accepted session_kwargs overrides.
+    """
+    from wafer._sync import SyncSession
+
+    session = SyncSession.__new__(SyncSession)
+    _init_base_session(session, session_kwargs)
 
     use_cookie_jar = session_kwargs.get("use_cookie_jar", False)
     jar = MockJar() if use_cookie_jar else None
@@ -461,98 +544,12 @@ def make_async_session(responses, **session_kwargs):
     from wafer._async import AsyncSession
 
     session = AsyncSession.__new__(AsyncSession)
-
-    session.headers = dict(DEFAULT_HEADERS)
-    session._chrome_headers = dict(DEFAULT_HEADERS)
-    session._user_headers = False
-
-    session.connect_timeout = DEFAULT_CONNECT_TIMEOUT
-    session.timeout = DEFAULT_TIMEOUT
-    _attempt = session_kwargs.get("attempt_timeout", None)
-    session.attempt_timeout = (
-        _normalize_timeout(_attempt) if _attempt is not None else None
-    )
-    session.max_retries = session_kwargs.get("max_retries", 3)
-    session.max_rotations = session_kwargs.get("max_rotations", 10)
-
-    session.max_failures = session_kwargs.get(
-        "max_failures", 3
-    )
-    session.max_response_size = session_kwargs.get(
-        "max_response_size", None
-    )
-    session._fingerprint = FingerprintManager(DEFAULT_EMULATION)
-    _pool = session_kwargs.get("fingerprint_pool", None)
-    session._fingerprint_pool = list(_pool) if _pool else None
-    session._pool_index = 0
-    session._pool_strikes = {}
-    session._cookie_cache = session_kwargs.get("cookie_cache", None)
-    session._cookie_scopes = {}
-    session._reddit_bootstrap_stats = _new_reddit_bootstrap_stats()
-    session._rate_limiter = session_kwargs.get("rate_limiter", None)
-    session._domain_failures = {}
-    session._last_url = {}
-    session._body_capable_domains = set()
-    embed_origin = session_kwargs.get("embed_origin", None)
-    embed = session_kwargs.get("embed", None)
-    if embed_origin and embed is None:
-        embed = "xhr"
-    session._embed = embed
-    session._embed_origin = embed_origin
-    session._embed_referers = session_kwargs.get(
-        "embed_referers", []
-    )
-    session.follow_redirects = session_kwargs.get(
-        "follow_redirects", True
-    )
-    session.max_redirects = session_kwargs.get("max_redirects", 10)
-    session._browser_solver = session_kwargs.get(
-        "browser_solver", None
-    )
-    session._owns_solver = session_kwargs.get("owns_solver", False)
-    session._solve_origin = session_kwargs.get("solve_origin", None)
-    session._recaptcha_v = {}
-    session._native_tls = None
-    session._native_tls_domains = set()
-    session._resolve = session_kwargs.get("resolve", None) or {}
-    session._proxy = None
-    session._proxy_url = None
-    session._rotate_every = session_kwargs.get("rotate_every", None)
-    session._request_count = 0
+    _init_base_session(session, session_kwargs)
     session._rotate_lock = asyncio.Lock()
     session._reddit_bootstrap_lock = asyncio.Lock()
     session._reddit_bootstrap_generation = 0
     session._reddit_bootstrap_client_generation = None
     session._client_generation = 0
-    profile = session_kwargs.get("profile", None)
-    session._profile = profile
-    session._om_identity = None
-    session._safari_identity = None
-    session._ios_safari_identity = None
-    session._dart_identity = None
-    session._safari_locale = "us"
-    session._tried_safari = profile in (
-        Profile.SAFARI,
-        Profile.IOS_SAFARI,
-        Profile.DART,
-    )
-
-    if profile is Profile.DART:
-        from wafer._dart import DartIdentity
-
-        session._dart_identity = DartIdentity()
-        session.headers = session._dart_identity.client_headers()
-        session._chrome_headers = None
-        session._fingerprint = None
-    elif profile is Profile.IOS_SAFARI:
-        from wafer._ios import IOSSafariIdentity
-
-        session._ios_safari_identity = IOSSafariIdentity()
-        session.headers = session._ios_safari_identity.client_headers()
-        session._chrome_headers = None
-        session._fingerprint = None
-
-    session._client_headers = session._compute_client_headers()
 
     async_responses = to_async_responses(responses)
     use_cookie_jar = session_kwargs.get("use_cookie_jar", False)
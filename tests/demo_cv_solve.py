@@ -21,14 +21,21 @@ MOCK_PATH = Path(__file__).parent / "mocks" / "geetest" / "slide.html"
 MOCK_URL = f"file://{MOCK_PATH.resolve()}"
 
 
-def extract_png(page, selector: str) -> bytes:
-    """Extract raw PNG bytes from a CSS background-image data URL."""
-    data_url = page.evaluate(f"""
-        getComputedStyle(document.querySelector('{selector}'))
-            .backgroundImage.slice(5, -2)
-    """)
-    _, encoded = data_url.split(",", 1)
-    return base64.b64decode(encoded)
+def extract_pngs(page, *selectors: str) -> list[bytes]:
+    """Extract raw PNG bytes from CSS background-image data URLs.
+
+    All selectors are read in a single page.evaluate round-trip.
+    """
+    data_urls = page.evaluate(
+        """(sels) => sels.map((s) =>
+            getComputedStyle(document.querySelector(s))
+                .backgroundImage.slice(5, -2))""",
+        list(selectors),
+    )
+    return [
+        base64.b64decode(data_url.partition(",")[2])
+        for data_url in data_urls
+    ]
 
 
 def solve_attempt(solver: BrowserSolver, page) -> bool:
@@ -41,11 +48,17 @@ def solve_attempt(solver: BrowserSolver, page) -> bool:
     solver._replay_idle(page, idle_x, idle_y)
 
     # --- CV: extract images and find notch ---
-    bg_png = extract_png(page, "#gt-bg")
-    piece_png = extract_png(page, "#gt-piece-bg")
+    bg_png, piece_png = extract_pngs(page, "#gt-bg", "#gt-piece-bg")
 
     x_offset, confidence = find_notch(bg_png, piece_png)
-    true_x = page.evaluate("targetX")
+    # Puzzle truth + geometry in one round-trip
+    geo = page.evaluate("""() => ({
+        targetX,
+        pieceSize: PIECE_SIZE,
+        bgW: BG_W,
+        trackW: document.getElementById('gt-track').offsetWidth,
+    })""")
+    true_x = geo["targetX"]
     print(
         f"  CV: x={x_offset} (truth={true_x}, "
         f"err={abs(x_offset - true_x)}px, conf={confidence:.3f})"
@@ -67,13 +80,10 @@ def solve_attempt(solver: BrowserSolver, page) -> bool:
     time.sleep(random.uniform(0.1, 0.3))
 
     # --- Drag: use mousse recording for realistic motion ---
-    track_w = page.evaluate(
-        "document.getElementById('gt-track').offsetWidth"
-    )
     handle_w_px = hbox["width"]
-    max_slide = track_w - handle_w_px
-    piece_size = page.evaluate("PIECE_SIZE")
-    native_bg_w = page.evaluate("BG_W")
+    max_slide = geo["trackW"] - handle_w_px
+    piece_size = geo["pieceSize"]
+    native_bg_w = geo["bgW"]
 
     handle_target = (x_offset / (native_bg_w - piece_size)) * max_slide
     end_x = handle_cx + handle_target
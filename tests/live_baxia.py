@@ -60,8 +60,9 @@ def trigger_tmd() -> str | None:
             log.warning("Error: %s", e)
             time.sleep(0.3)
             continue
-        body = resp.text()
-        if "/_____tmd_____/punish" in body:
+        # Marker is ASCII: search the raw bytes, no UTF-8 decode needed
+        body = resp.bytes()
+        if b"/_____tmd_____/punish" in body:
             log.info("TMD triggered after %d requests!", i + 1)
             return url
         log.info("  -> %d (%d bytes)", resp.status.as_int(), len(body))
@@ -96,11 +97,11 @@ def main():
                 route.continue_()
                 return
             body = resp.body()
-            # Inject stealth at the start
-            if b"<head>" in body:
-                body = body.replace(
-                    b"<head>", b"<head>" + STEALTH_SCRIPT
-                )
+            # Inject stealth at the start (single scan for <head>)
+            head = body.find(b"<head>")
+            if head >= 0:
+                end = head + len(b"<head>")
+                body = body[:end] + STEALTH_SCRIPT + body[end:]
             elif b"<script>" in body:
                 # TMD page is just a <script> tag, no HTML structure
                 body = STEALTH_SCRIPT + body
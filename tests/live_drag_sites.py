@@ -7,22 +7,31 @@ Tests the drag solver against:
 4. AliExpress (Alibaba Cloud CAPTCHA 2.0 — recon only)
 
 Usage:
-    uv run python tests/live_drag_sites.py [site]
+    uv run python tests/live_drag_sites.py [site] [--parallel]
 
     site: geetest | bilibili | kucoin | aliexpress | all
     Default: geetest
+    --parallel: with ``all``, run every site at once, one browser each
+
+    WAFER_DEBUG_SCREENSHOTS=1 also saves full-page screenshots of each
+    intermediate step (otherwise only success evidence and failures).
 """
 
+import functools
 import json
 import logging
+import os
 import random
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.parse import urlparse
 
 from patchright.sync_api import sync_playwright
 
+from tests.live_helpers import wait_for_images
+
 logging.basicConfig(
     level=logging.DEBUG,
     format="%(asctime)s %(levelname)-7s %(message)s",
@@ -32,11 +41,12 @@ log = logging.getLogger("live_drag")
 EXTENSION_PATH = str(Path("wafer/browser/_extensions/screenxy").resolve())
 OUT = Path("recon_output/drag_sites")
 OUT.mkdir(parents=True, exist_ok=True)
+DEBUG_SCREENSHOTS = bool(os.environ.get("WAFER_DEBUG_SCREENSHOTS"))
 
 
 def launch_browser(p):
-    """Launch Chrome with screenxy extension."""
-    browser = p.chromium.launch(
+    """Launch Chrome with screenxy extension (once per run)."""
+    return p.chromium.launch(
         channel="chrome",
         headless=False,
         args=[
@@ -44,18 +54,71 @@ def launch_browser(p):
             f"--load-extension={EXTENSION_PATH}",
         ],
     )
-    page = browser.new_page(viewport={"width": 1280, "height": 800})
-    return browser, page
+
+
+def new_site_page(browser):
+    """Open an isolated context + page for one site.
+
+    Contexts are cheap; relaunching Chrome per site is not.
+    """
+    context = browser.new_context(viewport={"width": 1280, "height": 800})
+    context.route("**/*", _block_heavy_resources)
+    return context, context.new_page()
+
+
+# Never needed for recon or solving. Stylesheets stay: the slider
+# geometry the drag solver measures depends on them.
+_BLOCKED_RESOURCE_TYPES = frozenset({"font", "media"})
+
+
+def _block_heavy_resources(route):
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+def debug_screenshot(page, path):
+    """Full-page screenshot of an intermediate step, if enabled.
+
+    Full-page renders cost hundreds of ms each, so intermediate steps are
+    only captured with WAFER_DEBUG_SCREENSHOTS=1.
+    """
+    if DEBUG_SCREENSHOTS:
+        page.screenshot(path=str(path), full_page=True)
+
+
+def wait_for_settle(page, timeout: int = 5000):
+    """Wait for network idle, capped at *timeout* ms.
+
+    Replaces fixed post-navigation sleeps: fast pages continue as soon
+    as they go quiet, slow ones still get the full budget.
+    """
+    try:
+        page.wait_for_load_state("networkidle", timeout=timeout)
+    except Exception:
+        log.debug("Network not idle after %dms, continuing", timeout)
 
 
 def setup_image_intercept(page, domains):
     """Capture PNG images from specified domains."""
-    captured = {"bg": None, "piece": None, "all_images": []}
+    # all_images is column-wise; rows are only built when dumped.
+    captured = {
+        "bg": None,
+        "piece": None,
+        "all_images": {"urls": [], "sizes": [], "types": []},
+    }
+    images = captured["all_images"]
+    # Built once: exact-host set + ".domain" suffixes for one C-level
+    # endswith() per response.
+    exact_domains = frozenset(domains)
+    dot_domains = tuple("." + d for d in domains)
 
     def _on_response(response):
         try:
-            host = urlparse(response.url).hostname or ""
-            if not any(host == d or host.endswith("." + d) for d in domains):
+            parsed = urlparse(response.url)
+            host = parsed.hostname or ""
+            if host not in exact_domains and not host.endswith(dot_domains):
                 return
             ct = response.headers.get("content-type", "")
             if "image/" not in ct and not any(
@@ -63,21 +126,28 @@ def setup_image_intercept(page, domains):
                 for ext in (".png", ".jpg", ".jpeg", ".webp")
             ):
                 return
-            body = response.body()
-            if not body:
-                return
-            path = urlparse(response.url).path
+            is_png = "image/png" in ct or response.url.endswith(".png")
+            if is_png:
+                body = response.body()
+                if not body:
+                    return
+                size = len(body)
+            else:
+                # Only PNGs can be puzzle layers. Size the rest from the
+                # header rather than pulling every body over CDP inside
+                # the (blocking) response handler.
+                body = None
+                size = int(response.headers.get("content-length") or 0)
+            path = parsed.path
             fname = path.split("/")[-1][:60]
             log.info(
                 "[NET] image %s (%d bytes) from %s",
-                fname, len(body), host,
+                fname, size, host,
             )
-            captured["all_images"].append({
-                "url": response.url,
-                "size": len(body),
-                "type": ct,
-            })
-            if "image/png" in ct or response.url.endswith(".png"):
+            images["urls"].append(response.url)
+            images["sizes"].append(size)
+            images["types"].append(ct)
+            if is_png:
                 if len(body) > 20_000:
                     captured["bg"] = body
                     log.info("  -> classified as BG")
@@ -91,58 +161,64 @@ def setup_image_intercept(page, domains):
     return captured
 
 
-def dump_captcha_dom(page, site_name):
-    """Dump CAPTCHA-related DOM structure for analysis."""
+# CAPTCHA-related DOM structure (GeeTest + Alibaba markers).
+CAPTCHA_DOM_JS = """() => {
+    const r = {};
+    r.hasInitGeetest4 = typeof window.initGeetest4 === 'function';
+    r.hasGeetestSlider = !!document.querySelector('.geetest_slider');
+    r.hasGeetestBtn = !!document.querySelector('.geetest_btn_click');
+    r.hasGeetestBg = !!document.querySelector('.geetest_bg');
+    r.geetestClasses = [...new Set(
+        [...document.querySelectorAll('[class*="geetest"]')]
+            .flatMap(e => [...e.classList]
+                .filter(c => c.startsWith('geetest_')))
+    )].sort();
+    // Check for Alibaba CAPTCHA
+    r.hasAliyunCaptcha = typeof window.initAliyunCaptcha === 'function';
+    r.hasAliyunModule = !!document.querySelector(
+        '.aliyunCaptcha-module'
+    );
+    // Look for any captcha-related elements
+    r.captchaElements = [...document.querySelectorAll(
+        '[class*="captcha"],[class*="CAPTCHA"],[class*="slider"],'
+        + '[class*="puzzle"],[id*="captcha"],[id*="CAPTCHA"]'
+    )].map(e => ({
+        tag: e.tagName,
+        id: e.id,
+        cls: e.className.toString().substring(0, 200),
+        visible: e.offsetWidth > 0 && e.offsetHeight > 0,
+    }));
+    // Check iframes
+    r.iframes = [...document.querySelectorAll('iframe')].map(f => ({
+        src: (f.src || '').substring(0, 200),
+        w: f.offsetWidth,
+        h: f.offsetHeight,
+    }));
+    return r;
+}"""
+
+
+def save_captcha_dom(site_name, gt_info):
+    """Write and log a CAPTCHA_DOM_JS result for *site_name*."""
     out_dir = OUT / site_name
     out_dir.mkdir(parents=True, exist_ok=True)
-
-    # Check for GeeTest
-    gt_info = page.evaluate("""() => {
-        const r = {};
-        r.hasInitGeetest4 = typeof window.initGeetest4 === 'function';
-        r.hasGeetestSlider = !!document.querySelector('.geetest_slider');
-        r.hasGeetestBtn = !!document.querySelector('.geetest_btn_click');
-        r.hasGeetestBg = !!document.querySelector('.geetest_bg');
-        r.geetestClasses = [...new Set(
-            [...document.querySelectorAll('[class*="geetest"]')]
-                .flatMap(e => [...e.classList]
-                    .filter(c => c.startsWith('geetest_')))
-        )].sort();
-        // Check for Alibaba CAPTCHA
-        r.hasAliyunCaptcha = typeof window.initAliyunCaptcha === 'function';
-        r.hasAliyunModule = !!document.querySelector(
-            '.aliyunCaptcha-module'
-        );
-        // Look for any captcha-related elements
-        r.captchaElements = [...document.querySelectorAll(
-            '[class*="captcha"],[class*="CAPTCHA"],[class*="slider"],'
-            + '[class*="puzzle"],[id*="captcha"],[id*="CAPTCHA"]'
-        )].map(e => ({
-            tag: e.tagName,
-            id: e.id,
-            cls: e.className.toString().substring(0, 200),
-            visible: e.offsetWidth > 0 && e.offsetHeight > 0,
-        }));
-        // Check iframes
-        r.iframes = [...document.querySelectorAll('iframe')].map(f => ({
-            src: (f.src || '').substring(0, 200),
-            w: f.offsetWidth,
-            h: f.offsetHeight,
-        }));
-        return r;
-    }""")
-
     (out_dir / "captcha_dom.json").write_text(
         json.dumps(gt_info, indent=2)
     )
     log.info("DOM dump for %s: %s", site_name, json.dumps(gt_info, indent=2))
+
+
+def dump_captcha_dom(page, site_name):
+    """Dump CAPTCHA-related DOM structure for analysis."""
+    gt_info = page.evaluate(CAPTCHA_DOM_JS)
+    save_captcha_dom(site_name, gt_info)
     return gt_info
 
 
 # ── Site-specific handlers ────────────────────────────────────────────
 
 
-def test_geetest_demo(page, captured):
+def test_geetest_demo(page, captured, solver):
     """GeeTest demo — known working baseline."""
     from wafer.browser._cv import find_notch
     from wafer.browser._drag import (
@@ -152,15 +228,11 @@ def test_geetest_demo(page, captured):
         _png_width,
         _wait_for_puzzle,
     )
-    from wafer.browser._solver import BrowserSolver
-
-    solver = BrowserSolver()
-    solver._ensure_recordings()
 
     url = "https://www.geetest.com/en/adaptive-captcha-demo"
     log.info("Navigating to %s", url)
     page.goto(url, wait_until="domcontentloaded")
-    time.sleep(5)
+    page.wait_for_selector(".tab-item.tab-item-1", timeout=10000)
 
     page.evaluate("window.scrollBy(0, 400)")
     time.sleep(1)
@@ -169,7 +241,7 @@ def test_geetest_demo(page, captured):
     tab = page.locator(".tab-item.tab-item-1").first
     tab.scroll_into_view_if_needed(timeout=5000)
     tab.click(timeout=5000)
-    time.sleep(2)
+    page.wait_for_selector("text=Bind to button", timeout=5000)
 
     # Select Bind style
     el = page.locator("text=Bind to button").first
@@ -192,17 +264,17 @@ def test_geetest_demo(page, captured):
         return False
 
     # Wait for images
-    deadline = time.monotonic() + 5.0
-    while time.monotonic() < deadline:
-        if captured["bg"] and captured["piece"]:
-            break
-        time.sleep(0.2)
+    wait_for_images(page, captured)
 
     bg_png = captured["bg"]
     piece_png = captured["piece"]
 
     if not bg_png or not piece_png:
-        bg_dom, piece_dom = _extract_images_from_dom(page, vendor)
+        missing = tuple(
+            key for key, png in (("bg", bg_png), ("piece", piece_png))
+            if not png
+        )
+        bg_dom, piece_dom = _extract_images_from_dom(page, vendor, missing)
         bg_png = bg_png or bg_dom
         piece_png = piece_png or piece_dom
 
@@ -260,7 +332,7 @@ def test_geetest_demo(page, captured):
     return False
 
 
-def test_bilibili(page, captured):
+def test_bilibili(page, captured, solver):
     """bilibili.com — GeeTest v4 on login page."""
     url = "https://passport.bilibili.com/login"
     log.info("Navigating to %s", url)
@@ -270,12 +342,10 @@ def test_bilibili(page, captured):
     except Exception:
         log.warning("Navigation timeout (expected for Chinese site)")
 
-    time.sleep(5)
+    wait_for_settle(page)
 
     # Screenshot and DOM dump
-    page.screenshot(
-        path=str(OUT / "bilibili" / "login_page.png"), full_page=True
-    )
+    debug_screenshot(page, OUT / "bilibili" / "login_page.png")
     dom_info = dump_captcha_dom(page, "bilibili")
 
     # Check if GeeTest is present
@@ -299,10 +369,7 @@ def test_bilibili(page, captured):
 
             # Re-check DOM
             dom_info = dump_captcha_dom(page, "bilibili_after_click")
-            page.screenshot(
-                path=str(OUT / "bilibili" / "after_click.png"),
-                full_page=True,
-            )
+            debug_screenshot(page, OUT / "bilibili" / "after_click.png")
     except Exception as e:
         log.info("Login button interaction: %s", e)
 
@@ -314,10 +381,8 @@ def test_bilibili(page, captured):
             timeout=5000,
         )
         log.info("GeeTest widget appeared!")
-        page.screenshot(
-            path=str(OUT / "bilibili" / "geetest_visible.png"),
-            full_page=True,
-        )
+        # Success evidence: the widget fits the viewport
+        page.screenshot(path=str(OUT / "bilibili" / "geetest_visible.png"))
         return True
     except Exception:
         log.info("No GeeTest widget appeared within 5s")
@@ -325,7 +390,7 @@ def test_bilibili(page, captured):
     return False
 
 
-def test_kucoin(page, captured):
+def test_kucoin(page, captured, solver):
     """kucoin.com — GeeTest v4 on login page."""
     url = "https://www.kucoin.com/login"
     log.info("Navigating to %s", url)
@@ -335,11 +400,9 @@ def test_kucoin(page, captured):
     except Exception:
         log.warning("Navigation timeout")
 
-    time.sleep(5)
+    wait_for_settle(page)
 
-    page.screenshot(
-        path=str(OUT / "kucoin" / "login_page.png"), full_page=True
-    )
+    debug_screenshot(page, OUT / "kucoin" / "login_page.png")
     dom_info = dump_captcha_dom(page, "kucoin")
 
     if dom_info.get("hasInitGeetest4"):
@@ -377,10 +440,7 @@ def test_kucoin(page, captured):
                 time.sleep(5)
 
                 dom_info = dump_captcha_dom(page, "kucoin_after_submit")
-                page.screenshot(
-                    path=str(OUT / "kucoin" / "after_submit.png"),
-                    full_page=True,
-                )
+                debug_screenshot(page, OUT / "kucoin" / "after_submit.png")
     except Exception as e:
         log.info("KuCoin interaction: %s", e)
 
@@ -392,10 +452,8 @@ def test_kucoin(page, captured):
             timeout=5000,
         )
         log.info("GeeTest widget appeared!")
-        page.screenshot(
-            path=str(OUT / "kucoin" / "geetest_visible.png"),
-            full_page=True,
-        )
+        # Success evidence: the widget fits the viewport
+        page.screenshot(path=str(OUT / "kucoin" / "geetest_visible.png"))
         return True
     except Exception:
         log.info("No GeeTest widget appeared within 5s")
@@ -403,7 +461,46 @@ def test_kucoin(page, captured):
     return False
 
 
-def test_aliexpress(page, captured):
+# Alibaba CAPTCHA (AliyunCaptcha / NoCaptcha) presence probe.
+ALIBABA_CHECK_JS = """() => {
+    const r = {};
+    // Check for AliyunCaptcha
+    r.hasInitAliyun = typeof window.initAliyunCaptcha === 'function';
+    // Check for NoCaptcha (older Alibaba)
+    r.hasNoCaptcha = typeof window.NoCaptcha === 'function';
+    r.hasNoCaptchaInit = typeof window.ALIYUN_CAPTCHA === 'object';
+    // Check for slider/puzzle elements
+    r.sliderElements = [...document.querySelectorAll(
+        '[class*="slider"],[class*="puzzle"],[class*="captcha"],'
+        + '[class*="nc-"],[class*="nc_"],[id*="nc_"]'
+    )].map(e => ({
+        tag: e.tagName,
+        id: e.id,
+        cls: e.className.toString().substring(0, 200),
+        visible: e.offsetWidth > 0 && e.offsetHeight > 0,
+        rect: (() => {
+            const b = e.getBoundingClientRect();
+            return {x: b.x, y: b.y, w: b.width, h: b.height};
+        })(),
+    }));
+    // Check for AliyunCaptcha SDK script
+    r.scripts = [...document.querySelectorAll('script[src]')]
+        .map(s => s.src)
+        .filter(s => s.includes('captcha') || s.includes('alicdn')
+            || s.includes('aliyun'));
+    // Check iframes (Alibaba may use iframes)
+    r.iframes = [...document.querySelectorAll('iframe')]
+        .map(f => ({
+            src: (f.src || '').substring(0, 300),
+            w: f.offsetWidth,
+            h: f.offsetHeight,
+            visible: f.offsetWidth > 0 && f.offsetHeight > 0,
+        }));
+    return r;
+}"""
+
+
+def test_aliexpress(page, captured, solver):
     """AliExpress — Alibaba Cloud CAPTCHA 2.0 recon."""
     url = "https://login.aliexpress.com/"
     log.info("Navigating to %s", url)
@@ -413,51 +510,16 @@ def test_aliexpress(page, captured):
     except Exception:
         log.warning("Navigation timeout")
 
-    time.sleep(5)
+    wait_for_settle(page)
 
     (OUT / "aliexpress").mkdir(parents=True, exist_ok=True)
-    page.screenshot(
-        path=str(OUT / "aliexpress" / "login_page.png"), full_page=True
+    debug_screenshot(page, OUT / "aliexpress" / "login_page.png")
+    # DOM dump + Alibaba probe in a single evaluate round-trip
+    probe = page.evaluate(
+        f"() => ({{dom: ({CAPTCHA_DOM_JS})(), ali: ({ALIBABA_CHECK_JS})()}})"
     )
-    dump_captcha_dom(page, "aliexpress")
-
-    # Check for Alibaba CAPTCHA
-    ali_check = page.evaluate("""() => {
-        const r = {};
-        // Check for AliyunCaptcha
-        r.hasInitAliyun = typeof window.initAliyunCaptcha === 'function';
-        // Check for NoCaptcha (older Alibaba)
-        r.hasNoCaptcha = typeof window.NoCaptcha === 'function';
-        r.hasNoCaptchaInit = typeof window.ALIYUN_CAPTCHA === 'object';
-        // Check for slider/puzzle elements
-        r.sliderElements = [...document.querySelectorAll(
-            '[class*="slider"],[class*="puzzle"],[class*="captcha"],'
-            + '[class*="nc-"],[class*="nc_"],[id*="nc_"]'
-        )].map(e => ({
-            tag: e.tagName,
-            id: e.id,
-            cls: e.className.toString().substring(0, 200),
-            visible: e.offsetWidth > 0 && e.offsetHeight > 0,
-            rect: (() => {
-                const b = e.getBoundingClientRect();
-                return {x: b.x, y: b.y, w: b.width, h: b.height};
-            })(),
-        }));
-        // Check for AliyunCaptcha SDK script
-        r.scripts = [...document.querySelectorAll('script[src]')]
-            .map(s => s.src)
-            .filter(s => s.includes('captcha') || s.includes('alicdn')
-                || s.includes('aliyun'));
-        // Check iframes (Alibaba may use iframes)
-        r.iframes = [...document.querySelectorAll('iframe')]
-            .map(f => ({
-                src: (f.src || '').substring(0, 300),
-                w: f.offsetWidth,
-                h: f.offsetHeight,
-                visible: f.offsetWidth > 0 && f.offsetHeight > 0,
-            }));
-        return r;
-    }""")
+    save_captcha_dom("aliexpress", probe["dom"])
+    ali_check = probe["ali"]
 
     (OUT / "aliexpress" / "alibaba_captcha_info.json").write_text(
         json.dumps(ali_check, indent=2)
@@ -502,12 +564,7 @@ def test_aliexpress(page, captured):
                 dump_captcha_dom(
                     page, "aliexpress_after_submit"
                 )
-                page.screenshot(
-                    path=str(
-                        OUT / "aliexpress" / "after_submit.png"
-                    ),
-                    full_page=True,
-                )
+                debug_screenshot(page, OUT / "aliexpress" / "after_submit.png")
 
                 # Deeper check after submit
                 ali_post = page.evaluate("""() => {
@@ -572,50 +629,99 @@ SITES = {
 }
 
 
+def run_site(browser, site_name, solver):
+    """Run one site's handler in a fresh context of *browser*."""
+    log.info("=" * 60)
+    log.info("Testing: %s", site_name)
+    log.info("=" * 60)
+
+    site_conf = SITES[site_name]
+    (OUT / site_name).mkdir(parents=True, exist_ok=True)
+
+    context, page = new_site_page(browser)
+    captured = setup_image_intercept(
+        page, site_conf["domains"]
+    )
+
+    result = False
+    try:
+        result = site_conf["handler"](page, captured, solver)
+        status = "PASS" if result else "RECON/FAIL"
+        log.info(
+            "=== %s: %s ===", site_name.upper(), status
+        )
+    except Exception as e:
+        log.error("Error testing %s: %s", site_name, e)
+    finally:
+        # Final state is only diagnostic when the handler failed
+        if not result:
+            page.screenshot(
+                path=str(OUT / site_name / "final.png"),
+                full_page=True,
+            )
+        # Save captured image info
+        images = captured["all_images"]
+        if images["urls"]:
+            rows = [
+                {"url": u, "size": n, "type": t}
+                for u, n, t in zip(
+                    images["urls"], images["sizes"], images["types"]
+                )
+            ]
+            (OUT / site_name / "images.json").write_text(
+                json.dumps(rows, indent=2)
+            )
+        time.sleep(3)
+        context.close()
+
+
+def run_site_isolated(site_name, solver):
+    """Run one site with its own Playwright driver + browser.
+
+    Playwright's sync API is bound to the thread that started it, so
+    each --parallel worker owns a full driver instead of sharing one.
+    """
+    with sync_playwright() as p:
+        browser = launch_browser(p)
+        try:
+            run_site(browser, site_name, solver)
+        finally:
+            browser.close()
+
+
 def main():
-    site = sys.argv[1] if len(sys.argv) > 1 else "geetest"
+    args = sys.argv[1:]
+    parallel = "--parallel" in args
+    args = [a for a in args if a != "--parallel"]
+    site = args[0] if args else "geetest"
     sites_to_test = list(SITES.keys()) if site == "all" else [site]
 
     if not all(s in SITES for s in sites_to_test):
         print(f"Unknown site. Options: {', '.join(SITES.keys())}, all")
         sys.exit(1)
 
-    with sync_playwright() as p:
-        for site_name in sites_to_test:
-            log.info("=" * 60)
-            log.info("Testing: %s", site_name)
-            log.info("=" * 60)
-
-            site_conf = SITES[site_name]
-            (OUT / site_name).mkdir(parents=True, exist_ok=True)
-
-            browser, page = launch_browser(p)
-            captured = setup_image_intercept(
-                page, site_conf["domains"]
-            )
+    from wafer.browser._solver import BrowserSolver
 
-            try:
-                result = site_conf["handler"](page, captured)
-                status = "PASS" if result else "RECON/FAIL"
-                log.info(
-                    "=== %s: %s ===", site_name.upper(), status
-                )
-            except Exception as e:
-                log.error("Error testing %s: %s", site_name, e)
-            finally:
-                page.screenshot(
-                    path=str(OUT / site_name / "final.png"),
-                    full_page=True,
-                )
-                # Save captured image info
-                if captured["all_images"]:
-                    (OUT / site_name / "images.json").write_text(
-                        json.dumps(
-                            captured["all_images"], indent=2
-                        )
-                    )
-                time.sleep(3)
-                browser.close()
+    # One solver (mouse recordings loaded once) for every site; handlers
+    # only replay recordings through it, so parallel workers can share it.
+    solver = BrowserSolver()
+    solver._ensure_recordings()
+    try:
+        if parallel and len(sites_to_test) > 1:
+            with ThreadPoolExecutor(max_workers=len(sites_to_test)) as pool:
+                list(pool.map(
+                    functools.partial(run_site_isolated, solver=solver),
+                    sites_to_test,
+                ))
+            return
+
+        with sync_playwright() as p:
+            browser = launch_browser(p)
+            for site_name in sites_to_test:
+                run_site(browser, site_name, solver)
+            browser.close()
+    finally:
+        solver.close()
 
 
 if __name__ == "__main__":
@@ -10,18 +10,20 @@ Usage:
 
 import logging
 import random
+import struct
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.parse import urlparse
 
 from patchright.sync_api import sync_playwright
 
-from wafer.browser._cv import find_notch
+from tests.live_helpers import wait_for_images
+from wafer.browser._cv import _piece_features, find_notch
 from wafer.browser._drag import (
     _check_result,
     _extract_images_from_dom,
     _get_geometry,
-    _png_width,
     _wait_for_puzzle,
 )
 from wafer.browser._solver import BrowserSolver
@@ -35,6 +37,10 @@ log = logging.getLogger("live_gt")
 DEMO_URL = "https://www.geetest.com/en/adaptive-captcha-demo"
 EXTENSION_PATH = str(Path("wafer/browser/_extensions/screenxy").resolve())
 
+# Piece decode/edge prep runs here as soon as the PNG lands, overlapping
+# the puzzle-visible wait; find_notch then hits _piece_features' cache.
+_PREP_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cv-prep")
+
 
 def setup_logged_intercept(page):
     """Attach network intercept with URL logging.
@@ -47,7 +53,8 @@ def setup_logged_intercept(page):
 
     def _on_response(response):
         try:
-            host = urlparse(response.url).hostname or ""
+            parsed = urlparse(response.url)
+            host = parsed.hostname or ""
             if not (host == "static.geetest.com"
                     or host.endswith(".geetest.com")):
                 return
@@ -57,7 +64,7 @@ def setup_logged_intercept(page):
             body = response.body()
             if not body:
                 return
-            path = urlparse(response.url).path
+            path = parsed.path
             log.info(
                 "[NET] PNG %s (%d bytes) from %s",
                 path.split("/")[-1], len(body), host,
@@ -67,6 +74,7 @@ def setup_logged_intercept(page):
                 log.info("  -> classified as BG")
             else:
                 captured["piece"] = body
+                _PREP_POOL.submit(_piece_features, body)
                 log.info("  -> classified as PIECE")
         except Exception:
             pass
@@ -79,7 +87,7 @@ def navigate_and_trigger(page, captured):
     """Navigate to demo, select Slide CAPTCHA + Bind, trigger."""
     log.info("Navigating to %s", DEMO_URL)
     page.goto(DEMO_URL, wait_until="domcontentloaded")
-    time.sleep(5)
+    page.wait_for_selector(".tab-item.tab-item-1", timeout=10000)
 
     # Scroll past sticky header
     page.evaluate("window.scrollBy(0, 400)")
@@ -90,7 +98,7 @@ def navigate_and_trigger(page, captured):
     tab = page.locator(".tab-item.tab-item-1").first
     tab.scroll_into_view_if_needed(timeout=5000)
     tab.click(timeout=5000)
-    time.sleep(2)
+    page.wait_for_selector("text=Bind to button", timeout=5000)
 
     # Select "Bind to button" style (most reliable trigger)
     log.info("Selecting Bind style...")
@@ -122,11 +130,7 @@ def solve_attempt(solver, page, captured) -> bool:
         return False
 
     # Wait for network intercept to capture images
-    deadline = time.monotonic() + 5.0
-    while time.monotonic() < deadline:
-        if captured["bg"] and captured["piece"]:
-            break
-        time.sleep(0.2)
+    wait_for_images(page, captured)
 
     bg_png = captured["bg"]
     piece_png = captured["piece"]
@@ -134,7 +138,11 @@ def solve_attempt(solver, page, captured) -> bool:
     # Fallback: DOM extraction (same origin on geetest.com)
     if not bg_png or not piece_png:
         log.info("Network intercept incomplete, trying DOM extraction")
-        bg_dom, piece_dom = _extract_images_from_dom(page, vendor)
+        missing = tuple(
+            key for key, png in (("bg", bg_png), ("piece", piece_png))
+            if not png
+        )
+        bg_dom, piece_dom = _extract_images_from_dom(page, vendor, missing)
         bg_png = bg_png or bg_dom
         piece_png = piece_png or piece_dom
 
@@ -155,13 +163,13 @@ def solve_attempt(solver, page, captured) -> bool:
     (out / "piece.png").write_bytes(piece_png)
     log.info("Saved puzzle images to %s", out)
 
-    # Check image dimensions
-    import struct
-    bg_w = struct.unpack(">I", bg_png[16:20])[0]
-    bg_h = struct.unpack(">I", bg_png[20:24])[0]
-    piece_w = struct.unpack(">I", piece_png[16:20])[0]
-    piece_h = struct.unpack(">I", piece_png[20:24])[0]
-    log.info("Dimensions: bg=%dx%d, piece=%dx%d", bg_w, bg_h, piece_w, piece_h)
+    # Check image dimensions (IHDR width + height, one unpack each)
+    native_bg_w, bg_h = struct.unpack(">II", bg_png[16:24])
+    native_piece_w, piece_h = struct.unpack(">II", piece_png[16:24])
+    log.info(
+        "Dimensions: bg=%dx%d, piece=%dx%d",
+        native_bg_w, bg_h, native_piece_w, piece_h,
+    )
 
     # CV: find notch offset
     x_offset, confidence = find_notch(bg_png, piece_png)
@@ -185,9 +193,6 @@ def solve_attempt(solver, page, captured) -> bool:
     handle_w = handle_box["width"]
     max_slide = track_width - handle_w
 
-    native_bg_w = _png_width(bg_png)
-    native_piece_w = _png_width(piece_png)
-
     if native_bg_w <= native_piece_w:
         log.error("Invalid dims: bg=%d, piece=%d", native_bg_w, native_piece_w)
         return False
@@ -248,7 +253,8 @@ def main():
                 f"--load-extension={EXTENSION_PATH}",
             ],
         )
-        page = browser.new_page(viewport={"width": 1280, "height": 800})
+        context = browser.new_context(viewport={"width": 1280, "height": 800})
+        page = context.new_page()
 
         # Set up network intercept early — catches all PNGs from
         # static.geetest.com.  We reset the dict before triggering
@@ -268,6 +274,7 @@ def main():
             log.info("Failure screenshot saved")
 
         time.sleep(5)
+        context.close()
         browser.close()
 
 
@@ -0,0 +1,24 @@
+"""Helpers shared by the live drag/slider CAPTCHA scripts.
+
+Used by live_geetest_demo.py and live_drag_sites.py.
+"""
+
+import time
+
+
+def wait_for_images(page, captured, timeout: float = 5.0) -> None:
+    """Block until the intercept has both bg and piece, or *timeout* s.
+
+    Waits on the page's next response event rather than sleeping: that
+    wakes as soon as an image lands and keeps Playwright dispatching
+    events (sync-API handlers only run inside Playwright calls).
+    """
+    deadline = time.monotonic() + timeout
+    while not (captured["bg"] and captured["piece"]):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        try:
+            page.wait_for_event("response", timeout=remaining * 1000)
+        except Exception:
+            return
@@ -12,6 +12,9 @@ import logging
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from patchright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 from wafer.browser._solver import BrowserSolver
 
@@ -22,21 +25,35 @@ logging.basicConfig(
 
 DUMP_DIR = os.path.join(os.path.dirname(__file__), "px_frame_dumps")
 
-# JS to deeply inspect #px-captcha and all its children
+# JS to deeply inspect #px-captcha and all its children.
+# Walks a flat querySelectorAll list (document order) instead of
+# recursing, and reads every style/rect in one pass with no DOM writes
+# in between so the renderer lays out once.  Returns {nodes: [...]}
+# where each node carries its parent/children indices into that list.
 INSPECT_JS = """() => {
     const el = document.querySelector('#px-captcha');
     if (!el) return {error: 'no #px-captcha'};
 
-    function inspect(node, depth) {
+    const all = [el, ...el.querySelectorAll('*')];
+    const index = new Map(all.map((n, i) => [n, i]));
+    const infos = all.map(n => ({
+        cs: window.getComputedStyle(n),
+        rect: n.getBoundingClientRect(),
+    }));
+
+    const nodes = all.map((node, i) => {
+        const {cs, rect} = infos[i];
+        const parent = i === 0 ? -1 : index.get(node.parentElement);
         const result = {
             tag: node.tagName,
             id: node.id || null,
             className: node.className || null,
-            depth: depth,
+            depth: parent === -1 ? 0 : null,
+            parent: parent,
+            children_idx: Array.from(node.children, c => index.get(c)),
         };
 
         // Computed styles
-        const cs = window.getComputedStyle(node);
         result.display = cs.display;
         result.visibility = cs.visibility;
         result.opacity = cs.opacity;
@@ -46,7 +63,6 @@ INSPECT_JS = """() => {
         result.overflow = cs.overflow;
 
         // Bounding rect
-        const rect = node.getBoundingClientRect();
         result.rect = {
             x: Math.round(rect.x),
             y: Math.round(rect.y),
@@ -87,19 +103,54 @@ INSPECT_JS = """() => {
             }
         }
 
-        // Recurse into children
-        result.children = [];
-        for (const child of node.children) {
-            result.children.push(inspect(child, depth + 1));
-        }
-
         return result;
+    });
+
+    // Document order puts parents first, so depth fills in one pass
+    for (let i = 1; i < nodes.length; i++) {
+        nodes[i].depth = nodes[nodes[i].parent].depth + 1;
     }
 
-    return inspect(el, 0);
+    return {nodes: nodes};
 }"""
 
 
+# Frame HTML (same serialization as frame.content()) plus body text in
+# one round-trip per frame.
+FRAME_DUMP_JS = """() => {
+    let content = '';
+    if (document.doctype) {
+        content = new XMLSerializer().serializeToString(document.doctype);
+    }
+    if (document.documentElement) {
+        content += document.documentElement.outerHTML;
+    }
+    return {
+        content: content,
+        bodyText: document.body ? document.body.textContent : null,
+    };
+}"""
+
+
+# Keywords whose surrounding text is echoed from each frame's body
+FRAME_KEYWORDS = ("press", "hold", "captcha", "human", "verify")
+
+
+def _write_all(path, data):
+    """Write *data* straight to an fd, bypassing Python's buffered IO."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _write_text(fpath, content):
+    _write_all(fpath, content.encode("utf-8", "replace"))
+
+
 def main():
     url = sys.argv[1] if len(sys.argv) > 1 else "https://www.wayfair.com"
 
@@ -114,30 +165,34 @@ def main():
     except Exception as e:
         print(f"Navigation error (may be expected): {e}")
 
-    # Poll for #px-captcha to appear
+    # Wait for #px-captcha to appear
     print("Waiting for PX challenge (up to 30s)...")
-    found = False
-    for i in range(60):
-        try:
-            content = page.content()
-            if "px-captcha" in content:
-                print(f"PX challenge detected after {i * 0.5:.1f}s")
-                found = True
-                break
-        except Exception:
-            pass
-        time.sleep(0.5)
+    started = time.monotonic()
+    try:
+        page.wait_for_selector("#px-captcha", state="attached", timeout=30000)
+        print(f"PX challenge detected after {time.monotonic() - started:.1f}s")
+        found = True
+    except PlaywrightTimeoutError:
+        found = False
 
     if not found:
         print("No PX challenge detected. Dumping page anyway.")
-
-    # Wait for captcha to fully render
-    print("Waiting 15s for captcha to fully render...")
-    for i in range(30):
-        time.sleep(0.5)
-        n = len(page.frames)
-        if i % 6 == 0:
-            print(f"  {i * 0.5:.0f}s: {n} frames")
+    else:
+        # Wait for captcha to render its iframe/canvas (polled in-page)
+        print("Waiting up to 15s for captcha to render...")
+        started = time.monotonic()
+        try:
+            page.wait_for_function(
+                "document.querySelector('#px-captcha')"
+                "?.querySelectorAll('iframe,canvas').length > 0",
+                timeout=15000,
+            )
+            print(
+                f"  Rendered after {time.monotonic() - started:.1f}s: "
+                f"{len(page.frames)} frames"
+            )
+        except PlaywrightTimeoutError:
+            print(f"  Not rendered after 15s: {len(page.frames)} frames")
 
     os.makedirs(DUMP_DIR, exist_ok=True)
     site = url.split("//")[-1].split("/")[0].replace("www.", "")
@@ -149,11 +204,12 @@ def main():
         tree = page.evaluate(INSPECT_JS)
         fname = f"{site}_{ts}_px-captcha-tree.json"
         fpath = os.path.join(DUMP_DIR, fname)
-        with open(fpath, "w") as f:
-            json.dump(tree, f, indent=2)
+        _write_text(fpath, json.dumps(tree, indent=2))
         print(f"Saved: {fname}")
 
-        # Print the tree
+        # Print the tree (rebuilt from the flat children_idx links)
+        nodes = tree.get("nodes", [])
+
         def print_node(node, indent=0):
             prefix = "  " * indent
             tag = node.get("tag", "?")
@@ -191,53 +247,61 @@ def main():
                     )
             print(line)
 
-            for child in node.get("children", []):
-                print_node(child, indent + 1)
+            for child_idx in node.get("children_idx", []):
+                print_node(nodes[child_idx], indent + 1)
 
-        print_node(tree)
+        if nodes:
+            print_node(nodes[0])
+        else:
+            print(tree.get("error", "(empty)"))
     except Exception as e:
         print(f"Deep inspect failed: {e}")
 
     # --- Dump all frames ---
+    # Playwright's sync API is bound to this thread, so the per-frame
+    # RPCs stay here; file writes go to a pool and overlap with them.
     print(f"\n=== Dumping {len(page.frames)} frames ===")
-    for i, frame in enumerate(page.frames):
-        frame_url = frame.url[:100] if frame.url else "(no url)"
-        print(f"\nFrame {i}: {frame_url}")
-        print(f"  Name: {frame.name!r}")
+    with ThreadPoolExecutor(max_workers=4) as writer:
+        writes = []
+        for i, frame in enumerate(page.frames):
+            frame_url = frame.url[:100] if frame.url else "(no url)"
+            print(f"\nFrame {i}: {frame_url}")
+            print(f"  Name: {frame.name!r}")
 
-        try:
-            content = frame.content()
+            try:
+                dump = frame.evaluate(FRAME_DUMP_JS)
+            except Exception as e:
+                print(f"  Error reading frame: {e}")
+                continue
+
+            content = dump["content"]
             fname = f"{site}_{ts}_frame{i}.html"
             fpath = os.path.join(DUMP_DIR, fname)
-            with open(fpath, "w") as f:
-                f.write(content)
-            print(f"  Saved: {fname} ({len(content)} bytes)")
+            writes.append(
+                (fname, writer.submit(_write_text, fpath, content))
+            )
+            print(f"  Saving: {fname} ({len(content)} bytes)")
 
             # Search for interesting text
+            body_text = dump["bodyText"]
+            if body_text:
+                lower = body_text.lower()
+                for keyword in FRAME_KEYWORDS:
+                    idx = lower.find(keyword)
+                    if idx != -1:
+                        start = max(0, idx - 20)
+                        end = min(len(body_text), idx + 40)
+                        snippet = body_text[start:end]
+                        print(
+                            f"  Text '{keyword}': "
+                            f"...{snippet!r}..."
+                        )
+
+        for fname, future in writes:
             try:
-                body_text = frame.locator("body").text_content(
-                    timeout=1000
-                )
-                if body_text:
-                    lower = body_text.lower()
-                    for keyword in [
-                        "press", "hold", "captcha",
-                        "human", "verify",
-                    ]:
-                        if keyword in lower:
-                            idx = lower.index(keyword)
-                            start = max(0, idx - 20)
-                            end = min(len(body_text), idx + 40)
-                            snippet = body_text[start:end]
-                            print(
-                                f"  Text '{keyword}': "
-                                f"...{snippet!r}..."
-                            )
-            except Exception:
-                pass
-
-        except Exception as e:
-            print(f"  Error reading frame: {e}")
+                future.result()
+            except Exception as e:
+                print(f"  Error saving {fname}: {e}")
 
     # --- Screenshot ---
     try:
@@ -255,8 +319,7 @@ def main():
             outer = el.evaluate("el => el.outerHTML")
             fname = f"{site}_{ts}_px-captcha.html"
             fpath = os.path.join(DUMP_DIR, fname)
-            with open(fpath, "w") as f:
-                f.write(outer)
+            _write_text(fpath, outer)
             print(
                 f"Saved #px-captcha outerHTML: {fname} "
                 f"({len(outer)} bytes)"
@@ -264,9 +327,12 @@ def main():
     except Exception as e:
         print(f"Could not dump #px-captcha: {e}")
 
-    print("\nKeeping browser open for 30s to inspect manually...")
-    for i in range(30):
-        time.sleep(1)
+    # Keep browser open to inspect manually
+    if sys.stdin.isatty():
+        input("\nPress Enter to close the browser...")
+    else:
+        print("\nKeeping browser open for 30s to inspect manually...")
+        time.sleep(30)
 
     context.close()
     solver.close()
@@ -12,19 +12,19 @@ import random
 import threading
 import time
 
+_TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
 
 class DelayHandler(http.server.SimpleHTTPRequestHandler):
     """Serves files from tests/ dir. Fake resources get random delays."""
 
+    _FAKE = "fake-resource"
+
     def __init__(self, *args, **kwargs):
-        super().__init__(
-            *args,
-            directory=os.path.dirname(__file__),
-            **kwargs,
-        )
+        super().__init__(*args, directory=_TESTS_DIR, **kwargs)
 
     def do_GET(self):
-        if "fake-resource" in self.path:
+        if self._FAKE in self.path:
             # Random delay 1-5s to simulate slow iframe resources
             delay = random.uniform(1.0, 5.0)
             time.sleep(delay)
@@ -38,13 +38,15 @@ class DelayHandler(http.server.SimpleHTTPRequestHandler):
 
     def log_message(self, format, *args):
         # Quiet unless it's a fake resource
-        if "fake-resource" in str(args):
+        if self._FAKE in str(args):
             print(f"  [server] {args[0]} {args[1]}")
 
 
 def start_server(port=8765):
     """Start the mock server in a daemon thread. Returns the URL."""
-    server = http.server.HTTPServer(("127.0.0.1", port), DelayHandler)
+    # Threaded so fake-resource delays overlap like parallel CDN fetches
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", port), DelayHandler)
+    server.daemon_threads = True
     thread = threading.Thread(target=server.serve_forever, daemon=True)
     thread.start()
     return f"http://127.0.0.1:{port}"
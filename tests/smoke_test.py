@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Multi-site smoke test for wafer.
 
-Tests all sites from site-list.md using wafer's SyncSession to verify:
+Tests all sites from site-list.md using wafer's AsyncSession to verify:
 1. TLS fingerprinting works against real WAFs
 2. Challenge detection correctly identifies WAF types
 3. Site list statuses are accurate and up to date
@@ -18,31 +18,52 @@ Usage:
     uv run python tests/smoke_test.py --waf cloudflare
     uv run python tests/smoke_test.py --url vinted.com
 
-    # Save results to JSON
+    # Save results to JSON (one compact row per site, in completion
+    # order; each row carries its url and tier)
     uv run python tests/smoke_test.py --json tests/smoke_results.json
+
+Sites run concurrently (``--concurrency``, default 16); requests to the
+same host are serialized and spaced ``--delay`` seconds apart.
 """
 
 import argparse
+import asyncio
 import datetime
 import json
 import logging
+import os
 import sys
 import time
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, NamedTuple
+from urllib.parse import urlparse
 
-from wafer import SyncSession
-from wafer._challenge import ChallengeType, detect_challenge
-from wafer._errors import (
-    ChallengeDetected,
-    ConnectionFailed,
-    RateLimited,
-    WaferError,
-)
+# wafer is imported where it's used so --help and filter typos answer
+# without paying for the full package import.
+if TYPE_CHECKING:
+    from wafer import AsyncSession
 
 # ── Site list ──────────────────────────────────────────────────────────
 # (tier, waf, url) — hardcoded from site-list.md to avoid fragile
 # markdown parsing. Keep in sync manually.
 
-SITES: list[tuple[int, str, str]] = [
+
+class Site(NamedTuple):
+    tier: int
+    waf: str
+    url: str
+    display: str  # url as shown in the results table
+
+
+def _short(url: str, n: int = 43) -> str:
+    """Strip the scheme and truncate to *n* chars for display."""
+    url = url.removeprefix("https://").removeprefix("http://")
+    return url if len(url) <= n else url[:n - 3] + "..."
+
+
+_SITE_ROWS: list[tuple[int, str, str]] = [
     # Tier 0: No Protection
     (0, "none", "https://httpbin.org/get"),
     (0, "none", "https://httpbin.org/headers"),
@@ -176,9 +197,22 @@ SITES: list[tuple[int, str, str]] = [
     (5, "none", "https://skyscanner.com"),
 ]
 
+SITES: tuple[Site, ...] = tuple(
+    Site(t, w, u, _short(u)) for t, w, u in _SITE_ROWS
+)
+
+# Lowercased (waf, url) per SITES entry, for the CLI substring filters
+_SITES_LOWER = tuple((s.waf.lower(), s.url.lower()) for s in SITES)
+
+# --tier alone is a lookup rather than a scan
+_BY_TIER: defaultdict[int, list[Site]] = defaultdict(list)
+for _site in SITES:
+    _BY_TIER[_site.tier].append(_site)
+del _site
+
 
 def classify_result(
-    status: int, size: int, challenge: ChallengeType | None, error: str | None
+    status: int, size: int, challenge: str | None, error: str | None
 ) -> str:
     """Classify a smoke test result."""
     if error:
@@ -192,10 +226,18 @@ def classify_result(
     return "blocked"
 
 
-def run_one(
-    session: SyncSession, url: str, timeout_s: float = 15.0
+async def run_one(
+    session: "AsyncSession", url: str, timeout_s: float = 15.0
 ) -> dict:
     """Test a single URL. Returns a result dict."""
+    from wafer._challenge import detect_challenge
+    from wafer._errors import (
+        ChallengeDetected,
+        ConnectionFailed,
+        RateLimited,
+        WaferError,
+    )
+
     result = {
         "url": url,
         "status": None,
@@ -208,9 +250,9 @@ def run_one(
         "final_url": None,
     }
 
-    t0 = time.monotonic()
+    t0 = time.perf_counter_ns()
     try:
-        resp = session.get(
+        resp = await session.get(
             url,
             timeout=datetime.timedelta(seconds=timeout_s),
         )
@@ -221,8 +263,9 @@ def run_one(
         result["elapsed"] = round(resp.elapsed, 2)
         result["final_url"] = resp.url
 
-        # Also run detect_challenge on the raw response for extra info
-        if resp.text:
+        # Also run detect_challenge on the raw response for extra info,
+        # unless the session already classified it
+        if not resp.challenge_type and resp.text:
             detected = detect_challenge(
                 resp.status_code, resp.headers, resp.text
             )
@@ -233,36 +276,36 @@ def run_one(
         result["status"] = e.status_code
         result["challenge"] = e.challenge_type
         result["error"] = f"ChallengeDetected: {e.challenge_type}"
-        result["elapsed"] = round(time.monotonic() - t0, 2)
     except RateLimited:
         result["status"] = 429
         result["error"] = "RateLimited"
-        result["elapsed"] = round(time.monotonic() - t0, 2)
     except ConnectionFailed as e:
         result["error"] = f"ConnectionFailed: {e.reason[:80]}"
-        result["elapsed"] = round(time.monotonic() - t0, 2)
     except WaferError as e:
         result["error"] = f"{type(e).__name__}: {str(e)[:80]}"
-        result["elapsed"] = round(time.monotonic() - t0, 2)
     except Exception as e:
         result["error"] = f"{type(e).__name__}: {str(e)[:80]}"
-        result["elapsed"] = round(time.monotonic() - t0, 2)
+    finally:
+        # Successes keep the session's resp.elapsed; failures have no
+        # response, so use wall clock rounded to 10 ms.
+        if result["error"]:
+            result["elapsed"] = round(time.perf_counter_ns() - t0, -7) / 1e9
 
     result["classification"] = classify_result(
         result["status"] or 0,
         result["size"],
-        ChallengeType(result["challenge"]) if result["challenge"] else None,
+        result["challenge"],
         result["error"],
     )
     return result
 
 
 def format_size(n: int) -> str:
-    if n >= 1_000_000:
-        return f"{n / 1_000_000:.1f}MB"
-    if n >= 1_000:
+    if n < 1_000:
+        return f"{n}B"
+    if n < 1_000_000:
         return f"{n / 1_000:.0f}KB"
-    return f"{n}B"
+    return f"{n / 1_000_000:.1f}MB"
 
 
 def print_header():
@@ -274,12 +317,7 @@ def print_header():
     print("-" * 160)
 
 
-def print_row(tier: int, waf: str, r: dict):
-    # Shorten URL for display
-    url = r["url"].replace("https://", "").replace("http://", "")
-    if len(url) > 43:
-        url = url[:40] + "..."
-
+def print_row(site: Site, r: dict):
     status_str = str(r["status"] or "---")
     size_str = format_size(r["size"]) if r["size"] else "---"
     challenge_str = r["challenge"] or "---"
@@ -289,10 +327,7 @@ def print_row(tier: int, waf: str, r: dict):
     if r["error"]:
         notes = r["error"][:50]
     elif r["final_url"] and r["final_url"] != r["url"]:
-        final_short = r["final_url"].replace("https://", "").replace("http://", "")
-        if len(final_short) > 40:
-            final_short = final_short[:37] + "..."
-        notes = f"-> {final_short}"
+        notes = f"-> {_short(r['final_url'], 40)}"
 
     # Color classification
     cls = r["classification"]
@@ -305,13 +340,100 @@ def print_row(tier: int, waf: str, r: dict):
     else:
         cls_str = "ERROR"
 
-    print(
-        f"{tier:<5} {waf:<14} {url:<45} "
+    # One write per row; rows come from the event loop thread only, so
+    # concurrent sites can't interleave mid-line.
+    sys.stdout.write(
+        f"{site.tier:<5} {site.waf:<14} {site.display:<45} "
         f"{status_str:<7} {size_str:<8} {challenge_str:<14} "
-        f"{cls_str:<10} {time_str:<6} {notes}"
+        f"{cls_str:<10} {time_str:<6} {notes}\n"
     )
 
 
+class ResultStream:
+    """Write results to a JSON file as they complete.
+
+    Each result is serialized on arrival instead of dumping the whole
+    run at the end; ``finish()`` closes the ``results`` array, appends
+    the summary counts and moves the file into place. Rows go to a temp
+    file next to ``path``, so a run that dies or is interrupted leaves
+    the previous results untouched. Use as a context manager.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        # A plain open() so the final file gets the usual umask mode
+        self._tmp_path = path + ".tmp"
+        self._f = open(self._tmp_path, "w")
+        timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        self._f.write(f'{{\n  "timestamp": {json.dumps(timestamp)},\n')
+        self._f.write('  "results": [')
+        self._sep = "\n    "
+
+    def write(self, r: dict) -> None:
+        self._f.write(self._sep + json.dumps(r, default=str))
+        self._sep = ",\n    "
+
+    def finish(self, counts: dict[str, int], total: int) -> None:
+        self._f.write("\n  ],\n")
+        self._f.write(f'  "counts": {json.dumps(counts)},\n')
+        self._f.write(f'  "total": {total}\n}}\n')
+        self._f.close()
+        os.replace(self._tmp_path, self._path)
+
+    def __enter__(self) -> "ResultStream":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        # Unfinished run: drop the partial file, keep the old results
+        if not self._f.closed:
+            self._f.close()
+            os.unlink(self._tmp_path)
+
+
+async def run_all(
+    sites: list[Site],
+    session_kwargs: dict,
+    args,
+    on_result: Callable[[dict], None] | None = None,
+) -> list[dict]:
+    """Run every site concurrently; rows print as they complete.
+
+    Independent hosts overlap up to ``args.concurrency``. Sites sharing a
+    host take turns behind a per-host lock, waiting out only what is left
+    of ``args.delay`` since that host's last response. The session itself
+    keeps its defaults, so retry and rotation timing match a normal run.
+    Results come back in ``sites`` order; ``on_result`` (if given) sees
+    each one as it completes.
+    """
+    from wafer import AsyncSession
+
+    sem = asyncio.Semaphore(args.concurrency)
+    host_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+    last_hit: dict[str, float] = {}
+
+    async with AsyncSession(**session_kwargs) as session:
+
+        async def worker(site: Site) -> dict:
+            host = urlparse(site.url).netloc
+            async with host_locks[host]:
+                # Sleep outside the semaphore so other hosts keep the slot
+                wait = last_hit.get(host, float("-inf")) + args.delay
+                wait -= time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                async with sem:
+                    r = await run_one(session, site.url, timeout_s=args.timeout)
+                last_hit[host] = time.monotonic()
+            r["tier"] = site.tier
+            r["waf_expected"] = site.waf
+            print_row(site, r)
+            if on_result is not None:
+                on_result(r)
+            return r
+
+        return await asyncio.gather(*(worker(site) for site in sites))
+
+
 def main():
     parser = argparse.ArgumentParser(description="Wafer multi-site smoke test")
     parser.add_argument(
@@ -336,21 +458,26 @@ def main():
     )
     parser.add_argument(
         "--delay", type=float, default=2.0,
-        help="Delay between requests in seconds (default: 2)",
+        help="Delay between requests to the same host (default: 2)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=16,
+        help="Maximum requests in flight (default: 16)",
     )
     args = parser.parse_args()
 
-    # Filter sites
-    sites = SITES
-    if args.tier is not None:
-        sites = [(t, w, u) for t, w, u in sites if t == args.tier]
-    if args.waf:
-        waf_lower = args.waf.lower()
-        sites = [(t, w, u) for t, w, u in sites if waf_lower in w.lower()]
-    if args.url:
-        url_lower = args.url.lower()
+    # Filter sites (single pass)
+    waf_lower = args.waf.lower() if args.waf else None
+    url_lower = args.url.lower() if args.url else None
+    if waf_lower is None and url_lower is None:
+        sites = list(SITES) if args.tier is None else _BY_TIER.get(args.tier, [])
+    else:
         sites = [
-            (t, w, u) for t, w, u in sites if url_lower in u.lower()
+            site
+            for site, (w, u) in zip(SITES, _SITES_LOWER)
+            if (args.tier is None or site.tier == args.tier)
+            and (waf_lower is None or waf_lower in w)
+            and (url_lower is None or url_lower in u)
         ]
 
     if not sites:
@@ -362,12 +489,12 @@ def main():
         print("  Browser solver: ENABLED")
     print()
 
-    # Configure logging: wafer at WARNING to suppress retry spam
+    # Configure logging: WARNING suppresses retry spam but still shows
+    # challenge detections. The "wafer" logger inherits this level and
+    # has only a NullHandler, so each record is formatted once, by root.
     logging.basicConfig(
         format="%(levelname)s %(name)s: %(message)s", level=logging.WARNING
     )
-    # But show challenge detections
-    logging.getLogger("wafer").setLevel(logging.WARNING)
 
     # Build session
     session_kwargs = {
@@ -382,24 +509,21 @@ def main():
         from wafer.browser import BrowserSolver
         session_kwargs["browser_solver"] = BrowserSolver()
 
-    session = SyncSession(**session_kwargs)
-
     print_header()
 
-    results = []
-    counts = {"pass": 0, "challenge": 0, "blocked": 0, "error": 0}
-
-    for i, (tier, waf, url) in enumerate(sites):
-        r = run_one(session, url, timeout_s=args.timeout)
-        r["tier"] = tier
-        r["waf_expected"] = waf
-        results.append(r)
-        counts[r["classification"]] += 1
-        print_row(tier, waf, r)
-
-        # Delay between different domains (not after last)
-        if i < len(sites) - 1:
-            time.sleep(args.delay)
+    with ResultStream(args.json) if args.json else nullcontext() as stream:
+        results = asyncio.run(run_all(
+            sites, session_kwargs, args,
+            on_result=stream.write if stream else None,
+        ))
+        sys.stdout.flush()
+        # Zero-seeded so every class shows up in the summary and JSON
+        counts = Counter(
+            dict.fromkeys(("pass", "challenge", "blocked", "error"), 0)
+        )
+        counts.update(r["classification"] for r in results)
+        if stream:
+            stream.finish(counts, len(results))
 
     # Summary
     print()
@@ -411,18 +535,8 @@ def main():
     print(f"  Error:     {counts['error']}")
     print("=" * 60)
 
-    # Save JSON if requested
-    json_path = args.json
-    if json_path:
-        output = {
-            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-            "total": len(results),
-            "counts": counts,
-            "results": results,
-        }
-        with open(json_path, "w") as f:
-            json.dump(output, f, indent=2, default=str)
-        print(f"\nResults saved to {json_path}")
+    if stream:
+        print(f"\nResults saved to {args.json}")
 
 
 if __name__ == "__main__":
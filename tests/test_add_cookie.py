@@ -1,45 +1,39 @@
 """Tests for session.add_cookie() / session.get_cookie() public cookie access."""
 
+import pytest
 
 from wafer import AsyncSession, Profile, SyncSession
 
 
-class TestSyncAddCookie:
-    def test_add_cookie_is_callable(self):
-        """SyncSession.add_cookie exists and is callable."""
-        session = SyncSession(cache_dir=None)
-        assert callable(session.add_cookie)
-
-    def test_add_cookie_signature(self):
-        """add_cookie accepts (raw_set_cookie, url) args."""
-        session = SyncSession(cache_dir=None)
-        # Should not raise -- injects cookie into jar
-        session.add_cookie("test=value; Path=/", "https://example.com")
-
-    def test_add_cookie_multiple(self):
-        """Multiple add_cookie calls don't raise."""
-        session = SyncSession(cache_dir=None)
-        session.add_cookie("a=1; Path=/", "https://example.com")
-        session.add_cookie("b=2; Path=/; Secure", "https://example.com")
-
-
-class TestAsyncAddCookie:
-    def test_add_cookie_is_callable(self):
-        """AsyncSession.add_cookie exists and is callable."""
-        session = AsyncSession(cache_dir=None)
-        assert callable(session.add_cookie)
-
-    def test_add_cookie_signature(self):
-        """add_cookie accepts (raw_set_cookie, url) args."""
-        session = AsyncSession(cache_dir=None)
-        # Should not raise -- injects cookie into jar
-        session.add_cookie("test=value; Path=/", "https://example.com")
-
-    def test_add_cookie_multiple(self):
-        """Multiple add_cookie calls don't raise."""
-        session = AsyncSession(cache_dir=None)
-        session.add_cookie("a=1; Path=/", "https://example.com")
-        session.add_cookie("b=2; Path=/; Secure", "https://example.com")
+# add_cookie tests only check that injection doesn't raise, so one
+# session per type serves the whole module.
+@pytest.fixture(
+    scope="module", params=[SyncSession, AsyncSession], ids=["sync", "async"]
+)
+def cookie_session(request):
+    return request.param(cache_dir=None)
+
+
+def test_add_cookie_is_callable(cookie_session):
+    """add_cookie exists and is callable on both session types."""
+    assert callable(cookie_session.add_cookie)
+
+
+@pytest.mark.parametrize(
+    "cookies",
+    [
+        [("test=value; Path=/", "https://example.com")],
+        [
+            ("a=1; Path=/", "https://example.com"),
+            ("b=2; Path=/; Secure", "https://example.com"),
+        ],
+    ],
+    ids=["single", "multiple"],
+)
+def test_add_cookie(cookie_session, cookies):
+    """add_cookie accepts (raw_set_cookie, url) and doesn't raise."""
+    for raw, url in cookies:
+        cookie_session.add_cookie(raw, url)
 
 
 class TestSyncGetCookie:
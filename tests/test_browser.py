@@ -12,13 +12,14 @@ import textwrap
 import threading
 import time
 from pathlib import Path
-from types import SimpleNamespace
+from types import MappingProxyType, SimpleNamespace
 from unittest.mock import ANY, MagicMock, PropertyMock, call, patch
 
 import pytest
 from wreq import Emulation
 
 from tests.conftest import (
+    MockBrowser,
     MockResponse,
     make_async_session,
     make_sync_session,
@@ -120,6 +121,28 @@ class TestSolveResult:
         assert result.user_agent == ""
 
 
+# Stable skeletons of the solved cookies used throughout; tests clone one
+# with dict(_BASE, value=...) and override only what they exercise.
+_CF_CLEARANCE_BASE = MappingProxyType({
+    "name": "cf_clearance",
+    "domain": ".example.com",
+    "path": "/",
+    "expires": -1,
+})
+_CF_BM_BASE = MappingProxyType({
+    "name": "__cf_bm",
+    "domain": ".example.com",
+    "path": "/",
+    "expires": -1,
+})
+_DATADOME_BASE = MappingProxyType({
+    "name": "datadome",
+    "domain": ".example.com",
+    "path": "/",
+    "expires": -1,
+})
+
+
 # ---------------------------------------------------------------------------
 # format_cookie_str tests
 # ---------------------------------------------------------------------------
@@ -1234,16 +1257,13 @@ class TestSyncBrowserSolveIntegration:
 
         browser_result = SolveResult(
             cookies=[
-                {
-                    "name": "cf_clearance",
-                    "value": "solved",
-                    "domain": ".example.com",
-                    "path": "/",
-                    "expires": -1,
-                    "secure": True,
-                    "httpOnly": True,
-                    "sameSite": "None",
-                }
+                dict(
+                    _CF_CLEARANCE_BASE,
+                    value="solved",
+                    secure=True,
+                    httpOnly=True,
+                    sameSite="None",
+                )
             ],
             user_agent=("Mozilla/5.0 Chrome/145.0.0.0 Safari/537.36"),
         )
@@ -1355,13 +1375,7 @@ class TestSyncBrowserSolveIntegration:
         mock_solver = MockBrowserSolver(
             result=SolveResult(
                 cookies=[
-                    {
-                        "name": "cf_clearance",
-                        "value": "stale",
-                        "domain": ".example.com",
-                        "path": "/",
-                        "expires": -1,
-                    }
+                    dict(_CF_CLEARANCE_BASE, value="stale")
                 ],
                 user_agent="Chrome/145",
             )
@@ -1393,22 +1407,13 @@ class TestSyncBrowserSolveIntegration:
 
         browser_result = SolveResult(
             cookies=[
-                {
-                    "name": "cf_clearance",
-                    "value": "solved123",
-                    "domain": ".example.com",
-                    "path": "/",
-                    "expires": -1,
-                    "secure": True,
-                    "httpOnly": True,
-                },
-                {
-                    "name": "__cf_bm",
-                    "value": "token456",
-                    "domain": ".example.com",
-                    "path": "/",
-                    "expires": 1800000000,
-                },
+                dict(
+                    _CF_CLEARANCE_BASE,
+                    value="solved123",
+                    secure=True,
+                    httpOnly=True,
+                ),
+                dict(_CF_BM_BASE, value="token456", expires=1800000000),
             ],
             user_agent="Chrome/145.0.0.0",
         )
@@ -1442,13 +1447,7 @@ class TestSyncBrowserSolveIntegration:
 
         browser_result = SolveResult(
             cookies=[
-                {
-                    "name": "cf_clearance",
-                    "value": "x",
-                    "domain": ".example.com",
-                    "path": "/",
-                    "expires": -1,
-                }
+                dict(_CF_CLEARANCE_BASE, value="x")
             ],
             user_agent=(
                 "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -1487,13 +1486,7 @@ class TestSyncBrowserSolveIntegration:
         )
         browser_result = SolveResult(
             cookies=[
-                {
-                    "name": "cf_clearance",
-                    "value": "x",
-                    "domain": ".example.com",
-                    "path": "/",
-                    "expires": -1,
-                }
+                dict(_CF_CLEARANCE_BASE, value="x")
             ],
             user_agent=ua,
             browser_version="150.0.7871.125",
@@ -1573,13 +1566,7 @@ class TestSyncBrowserSolveIntegration:
         )
         browser_result = SolveResult(
             cookies=[
-                {
-                    "name": "cf_clearance",
-                    "value": "x",
-                    "domain": ".example.com",
-                    "path": "/",
-                    "expires": -1,
-                }
+                dict(_CF_CLEARANCE_BASE, value="x")
             ],
             user_agent=ua,
             browser_version=None,  # force the UA-extraction fallback
@@ -1651,13 +1638,7 @@ class TestSyncBrowserSolveIntegration:
 
         browser_result = SolveResult(
             cookies=[
-                {
-                    "name": "datadome",
-                    "value": "solved",
-                    "domain": ".example.com",
-                    "path": "/",
-                    "expires": -1,
-                }
+                dict(_DATADOME_BASE, value="solved")
             ],
             user_agent="Chrome/145",
         )
@@ -1873,13 +1854,7 @@ class TestBrowserPassthrough:
 
         browser_result = SolveResult(
             cookies=[
-                {
-                    "name": "cf_clearance",
-                    "value": "solved",
-                    "domain": ".example.com",
-                    "path": "/",
-                    "expires": -1,
-                }
+                dict(_CF_CLEARANCE_BASE, value="solved")
             ],
             user_agent="Chrome/145.0.0.0",
             response=None,  # Normal solve, no passthrough
@@ -1956,13 +1931,7 @@ class TestBrowserPassthrough:
         ]
         browser_result = SolveResult(
             cookies=[
-                {
-                    "name": "cf_clearance",
-                    "value": "tok",
-                    "domain": ".example.com",
-                    "path": "/",
-                    "expires": -1,
-                }
+                dict(_CF_CLEARANCE_BASE, value="tok")
             ],
             user_agent="Chrome/145.0.0.0",
             response=CapturedResponse(
@@ -2028,16 +1997,13 @@ class TestSolveOrigin:
     def _solved_result(self):
         return SolveResult(
             cookies=[
-                {
-                    "name": "cf_clearance",
-                    "value": "solved",
-                    "domain": ".example.com",
-                    "path": "/",
-                    "expires": -1,
-                    "secure": True,
-                    "httpOnly": True,
-                    "sameSite": "None",
-                }
+                dict(
+                    _CF_CLEARANCE_BASE,
+                    value="solved",
+                    secure=True,
+                    httpOnly=True,
+                    sameSite="None",
+                )
             ],
             user_agent="Mozilla/5.0 Chrome/145.0.0.0 Safari/537.36",
         )
@@ -2573,13 +2539,7 @@ class TestAsyncBrowserSolveIntegration:
 
         browser_result = SolveResult(
             cookies=[
-                {
-                    "name": "cf_clearance",
-                    "value": "solved",
-                    "domain": ".example.com",
-                    "path": "/",
-                    "expires": -1,
-                }
+                dict(_CF_CLEARANCE_BASE, value="solved")
             ],
             user_agent="Chrome/145.0.0.0",
         )
@@ -2628,13 +2588,7 @@ class TestAsyncBrowserSolveIntegration:
 
         browser_result = SolveResult(
             cookies=[
-                {
-                    "name": "cf_clearance",
-                    "value": "async_solved",
-                    "domain": ".example.com",
-                    "path": "/",
-                    "expires": -1,
-                }
+                dict(_CF_CLEARANCE_BASE, value="async_solved")
             ],
             user_agent="Chrome/145",
         )
@@ -2669,13 +2623,7 @@ class TestAsyncBrowserSolveIntegration:
         )
         browser_result = SolveResult(
             cookies=[
-                {
-                    "name": "cf_clearance",
-                    "value": "x",
-                    "domain": ".example.com",
-                    "path": "/",
-                    "expires": -1,
-                }
+                dict(_CF_CLEARANCE_BASE, value="x")
             ],
             user_agent=ua,
             browser_version="150.0.7871.125",
@@ -2750,13 +2698,7 @@ class TestAsyncBrowserSolveIntegration:
         )
         browser_result = SolveResult(
             cookies=[
-                {
-                    "name": "cf_clearance",
-                    "value": "x",
-                    "domain": ".example.com",
-                    "path": "/",
-                    "expires": -1,
-                }
+                dict(_CF_CLEARANCE_BASE, value="x")
             ],
             user_agent=ua,
             browser_version=None,  # force the UA-extraction fallback
@@ -2820,22 +2762,61 @@ class TestInterceptResultDataclass:
 # ---------------------------------------------------------------------------
 
 
+class _MockPwResponse:
+    """Playwright Response stand-in: the attributes intercept_iframe reads."""
+
+    __slots__ = ("url", "status", "headers", "_body")
+
+    def __init__(self, url, status, headers, body):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self._body = body
+
+    def body(self):
+        return self._body
+
+
+class _BodylessPwResponse(_MockPwResponse):
+    """A response whose body() raises, like a redirect's."""
+
+    __slots__ = ()
+
+    def body(self):
+        raise Exception("Response body unavailable")
+
+
 def _make_mock_pw_response(url, status=200, headers=None, body=b""):
     """Create a mock Playwright Response object."""
-    resp = MagicMock()
-    resp.url = url
-    resp.status = status
-    resp.headers = headers or {}
-    resp.body.return_value = body
-    return resp
+    return _MockPwResponse(url, status, headers or {}, body)
+
 
+@pytest.fixture(scope="class")
+def class_without_sleep():
+    """Patch time.sleep once for a whole test class instead of per test."""
+    with patch("time.sleep"):
+        yield
 
+
+# One solver (and its worker thread) serves every intercept test; each test
+# wires fresh browser/context/page mocks onto it via mocked_solver.
+@pytest.fixture(scope="module")
+def intercept_solver():
+    solver = BrowserSolver()
+    yield solver
+    solver._browser = None
+    solver._playwright = None
+    solver.close()
+
+
+@pytest.mark.usefixtures("class_without_sleep")
 class TestIframeIntercept:
     """Test intercept_iframe() with mocked Playwright internals."""
 
-    def _make_solver_with_mock_browser(self):
-        """Create a BrowserSolver with mocked browser/playwright."""
-        solver = BrowserSolver()
+    @pytest.fixture
+    def mocked_solver(self, intercept_solver):
+        """The shared BrowserSolver with mocked browser/playwright."""
+        solver = intercept_solver
         solver._browser = MagicMock()
         solver._browser.is_connected.return_value = True
         solver._playwright = MagicMock()
@@ -2844,16 +2825,14 @@ class TestIframeIntercept:
             "AppleWebKit/537.36 Chrome/145.0.0.0 Safari/537.36"
         )
         solver._needs_screenxy_patch = False
-        return solver
-
-    def test_captures_target_domain_responses(self):
-        solver = self._make_solver_with_mock_browser()
-
-        # Mock context and page
         mock_context = MagicMock()
         mock_page = MagicMock()
         solver._browser.new_context.return_value = mock_context
         mock_context.new_page.return_value = mock_page
+        return solver, mock_context, mock_page
+
+    def test_captures_target_domain_responses(self, mocked_solver):
+        solver, mock_context, mock_page = mocked_solver
 
         # Simulate responses via the on("response") handler
         response_handler = None
@@ -2913,12 +2892,11 @@ class TestIframeIntercept:
 
         mock_page.goto = fake_goto
 
-        with patch("time.sleep"):
-            result = solver.intercept_iframe(
-                embedder_url="https://seaway-greatlakes.com/marine_traffic/en/marineTraffic_stCatherine.html",
-                target_domain="marinetraffic.com",
-                timeout=10.0,
-            )
+        result = solver.intercept_iframe(
+            embedder_url="https://seaway-greatlakes.com/marine_traffic/en/marineTraffic_stCatherine.html",
+            target_domain="marinetraffic.com",
+            timeout=10.0,
+        )
 
         assert result is not None
         # Should capture 2 marinetraffic responses, not the seaway one
@@ -2931,13 +2909,8 @@ class TestIframeIntercept:
         assert result.cookies[0]["name"] == "mt_session"
         assert result.user_agent == solver._browser_ua
 
-    def test_no_matching_responses(self):
-        solver = self._make_solver_with_mock_browser()
-
-        mock_context = MagicMock()
-        mock_page = MagicMock()
-        solver._browser.new_context.return_value = mock_context
-        mock_context.new_page.return_value = mock_page
+    def test_no_matching_responses(self, mocked_solver):
+        solver, mock_context, mock_page = mocked_solver
 
         def capture_on(event, handler):
             pass  # No responses fired
@@ -2945,24 +2918,18 @@ class TestIframeIntercept:
         mock_page.on = capture_on
         mock_context.cookies.return_value = []
 
-        with patch("time.sleep"):
-            result = solver.intercept_iframe(
-                embedder_url="https://seaway-greatlakes.com/page",
-                target_domain="marinetraffic.com",
-            )
+        result = solver.intercept_iframe(
+            embedder_url="https://seaway-greatlakes.com/page",
+            target_domain="marinetraffic.com",
+        )
 
         assert result is not None
         assert result.responses == []
         assert result.cookies == []
 
-    def test_response_body_failure_captured_as_empty(self):
+    def test_response_body_failure_captured_as_empty(self, mocked_solver):
         """If response.body() throws (e.g. redirect), body is empty bytes."""
-        solver = self._make_solver_with_mock_browser()
-
-        mock_context = MagicMock()
-        mock_page = MagicMock()
-        solver._browser.new_context.return_value = mock_context
-        mock_context.new_page.return_value = mock_page
+        solver, mock_context, mock_page = mocked_solver
 
         response_handler = None
 
@@ -2974,11 +2941,12 @@ class TestIframeIntercept:
         mock_page.on = capture_on
 
         # Response whose body() throws
-        bad_resp = MagicMock()
-        bad_resp.url = "https://www.marinetraffic.com/redirect"
-        bad_resp.status = 301
-        bad_resp.headers = {"location": "/new-path"}
-        bad_resp.body.side_effect = Exception("Response body unavailable")
+        bad_resp = _BodylessPwResponse(
+            "https://www.marinetraffic.com/redirect",
+            301,
+            {"location": "/new-path"},
+            None,
+        )
 
         def fake_goto(url, **kwargs):
             response_handler(bad_resp)
@@ -2986,25 +2954,60 @@ class TestIframeIntercept:
         mock_page.goto = fake_goto
         mock_context.cookies.return_value = []
 
-        with patch("time.sleep"):
-            result = solver.intercept_iframe(
-                embedder_url="https://seaway-greatlakes.com/page",
-                target_domain="marinetraffic.com",
-            )
+        result = solver.intercept_iframe(
+            embedder_url="https://seaway-greatlakes.com/page",
+            target_domain="marinetraffic.com",
+        )
 
         assert result is not None
         assert len(result.responses) == 1
         assert result.responses[0].body == b""
         assert result.responses[0].status == 301
 
-    def test_subdomain_matching(self):
-        """target_domain matches subdomains (www.X, tiles.X, etc.)."""
-        solver = self._make_solver_with_mock_browser()
+    def test_max_body_size_truncates_large_bodies(self, mocked_solver):
+        """Bodies over max_body_size are cut down and keep their full length."""
+        solver, mock_context, mock_page = mocked_solver
 
-        mock_context = MagicMock()
-        mock_page = MagicMock()
-        solver._browser.new_context.return_value = mock_context
-        mock_context.new_page.return_value = mock_page
+        response_handler = None
+
+        def capture_on(event, handler):
+            nonlocal response_handler
+            if event == "response":
+                response_handler = handler
+
+        mock_page.on = capture_on
+
+        tile = _make_mock_pw_response(
+            "https://tiles.marinetraffic.com/tile.png",
+            body=b"\x89PNG" + b"\x00" * 60,
+        )
+        small = _make_mock_pw_response(
+            "https://www.marinetraffic.com/api", body=b'{"ok":1}'
+        )
+
+        def fake_goto(url, **kwargs):
+            response_handler(tile)
+            response_handler(small)
+
+        mock_page.goto = fake_goto
+        mock_context.cookies.return_value = []
+
+        result = solver.intercept_iframe(
+            embedder_url="https://seaway-greatlakes.com/page",
+            target_domain="marinetraffic.com",
+            max_body_size=16,
+        )
+
+        assert result is not None
+        truncated, whole = result.responses
+        assert truncated.body == b"\x89PNG" + b"\x00" * 12
+        assert truncated.full_length == 64
+        assert whole.body == b'{"ok":1}'
+        assert whole.full_length is None
+
+    def test_subdomain_matching(self, mocked_solver):
+        """target_domain matches subdomains (www.X, tiles.X, etc.)."""
+        solver, mock_context, mock_page = mocked_solver
 
         response_handler = None
 
@@ -3053,11 +3056,10 @@ class TestIframeIntercept:
         mock_page.goto = fake_goto
         mock_context.cookies.return_value = []
 
-        with patch("time.sleep"):
-            result = solver.intercept_iframe(
-                embedder_url="https://embedder.example.com",
-                target_domain="marinetraffic.com",
-            )
+        result = solver.intercept_iframe(
+            embedder_url="https://embedder.example.com",
+            target_domain="marinetraffic.com",
+        )
 
         assert result is not None
         # Should match root domain + subdomains, NOT notmarinetraffic.com
@@ -3080,15 +3082,10 @@ class TestIframeIntercept:
 
         assert result is None
 
-    def test_navigation_error_still_captures(self):
+    def test_navigation_error_still_captures(self, mocked_solver):
         """Even if goto() raises, captured responses before the error
         are still returned."""
-        solver = self._make_solver_with_mock_browser()
-
-        mock_context = MagicMock()
-        mock_page = MagicMock()
-        solver._browser.new_context.return_value = mock_context
-        mock_context.new_page.return_value = mock_page
+        solver, mock_context, mock_page = mocked_solver
 
         response_handler = None
 
@@ -3114,48 +3111,37 @@ class TestIframeIntercept:
         mock_page.goto = failing_goto
         mock_context.cookies.return_value = []
 
-        with patch("time.sleep"):
-            result = solver.intercept_iframe(
-                embedder_url="https://seaway-greatlakes.com/page",
-                target_domain="marinetraffic.com",
-            )
+        result = solver.intercept_iframe(
+            embedder_url="https://seaway-greatlakes.com/page",
+            target_domain="marinetraffic.com",
+        )
 
         assert result is not None
         assert len(result.responses) == 1
         assert result.responses[0].body == b"partial data"
 
-    def test_context_closed_on_success(self):
+    def test_context_closed_on_success(self, mocked_solver):
         """Context is closed even after successful intercept."""
-        solver = self._make_solver_with_mock_browser()
-
-        mock_context = MagicMock()
-        mock_page = MagicMock()
-        solver._browser.new_context.return_value = mock_context
-        mock_context.new_page.return_value = mock_page
+        solver, mock_context, mock_page = mocked_solver
         mock_page.on = lambda *a: None
         mock_context.cookies.return_value = []
 
-        with patch("time.sleep"):
-            solver.intercept_iframe(
-                embedder_url="https://seaway-greatlakes.com/page",
-                target_domain="marinetraffic.com",
-            )
+        solver.intercept_iframe(
+            embedder_url="https://seaway-greatlakes.com/page",
+            target_domain="marinetraffic.com",
+        )
 
         mock_context.close.assert_called_once()
 
-    def test_context_closed_on_error(self):
+    def test_context_closed_on_error(self, mocked_solver):
         """Context is closed even if an exception occurs."""
-        solver = self._make_solver_with_mock_browser()
-
-        mock_context = MagicMock()
-        solver._browser.new_context.return_value = mock_context
+        solver, mock_context, _ = mocked_solver
         mock_context.new_page.side_effect = RuntimeError("page crash")
 
-        with patch("time.sleep"):
-            result = solver.intercept_iframe(
-                embedder_url="https://seaway-greatlakes.com/page",
-                target_domain="marinetraffic.com",
-            )
+        result = solver.intercept_iframe(
+            embedder_url="https://seaway-greatlakes.com/page",
+            target_domain="marinetraffic.com",
+        )
 
         assert result is None
         mock_context.close.assert_called_once()
@@ -3321,9 +3307,16 @@ def _setup_recordings_dir(tmp_path):
     return tmp_path
 
 
+# Built once per module; tests that add files use _setup_recordings_dir on
+# their own tmp_path instead, so this tree stays read-only.
+@pytest.fixture(scope="module")
+def recordings_dir(tmp_path_factory):
+    return _setup_recordings_dir(tmp_path_factory.mktemp("recordings"))
+
+
 class TestRecordingLoader:
-    def test_loads_all_categories(self, tmp_path):
-        rec_dir = _setup_recordings_dir(tmp_path)
+    def test_loads_all_categories(self, recordings_dir):
+        rec_dir = recordings_dir
         solver = BrowserSolver()
         with patch(
             "importlib.resources.files",
@@ -3366,8 +3359,8 @@ class TestRecordingLoader:
 
         assert result is False
 
-    def test_cached_after_first_call(self, tmp_path):
-        rec_dir = _setup_recordings_dir(tmp_path)
+    def test_cached_after_first_call(self, recordings_dir):
+        rec_dir = recordings_dir
         solver = BrowserSolver()
         pkg_mock = MagicMock()
         pkg_mock.__truediv__ = lambda self, name: rec_dir
@@ -3382,8 +3375,8 @@ class TestRecordingLoader:
         result = solver._ensure_recordings()
         assert result is True
 
-    def test_path_recordings_have_angle(self, tmp_path):
-        rec_dir = _setup_recordings_dir(tmp_path)
+    def test_path_recordings_have_angle(self, recordings_dir):
+        rec_dir = recordings_dir
         solver = BrowserSolver()
         pkg_mock = MagicMock()
         pkg_mock.__truediv__ = lambda self, name: rec_dir
@@ -3855,10 +3848,10 @@ class TestFindPxButton:
         assert solver._find_px_button(page, timeout=0.1) is None
 
 
+@pytest.mark.usefixtures("class_without_sleep")
 class TestWaitForPxSolve:
-    @patch("time.sleep")
     @patch("time.monotonic")
-    def test_success_captcha_gone(self, mock_mono, mock_sleep):
+    def test_success_captcha_gone(self, mock_mono):
         from wafer.browser._perimeterx import wait_for_px_solve
 
         page = MagicMock()
@@ -3871,9 +3864,8 @@ class TestWaitForPxSolve:
 
         assert wait_for_px_solve(page, timeout=20.0) is True
 
-    @patch("time.sleep")
     @patch("time.monotonic")
-    def test_failure_try_again(self, mock_mono, mock_sleep):
+    def test_failure_try_again(self, mock_mono):
         from wafer.browser._perimeterx import wait_for_px_solve
 
         page = MagicMock()
@@ -3899,9 +3891,8 @@ class TestWaitForPxSolve:
 
         assert wait_for_px_solve(page, timeout=20.0) is False
 
-    @patch("time.sleep")
     @patch("time.monotonic")
-    def test_navigation_exception_retries(self, mock_mono, mock_sleep):
+    def test_navigation_exception_retries(self, mock_mono):
         from wafer.browser._perimeterx import wait_for_px_solve
 
         page = MagicMock()
@@ -3916,9 +3907,8 @@ class TestWaitForPxSolve:
 
         assert wait_for_px_solve(page, timeout=20.0) is True
 
-    @patch("time.sleep")
     @patch("time.monotonic")
-    def test_timeout(self, mock_mono, mock_sleep):
+    def test_timeout(self, mock_mono):
         from wafer.browser._perimeterx import wait_for_px_solve
 
         page = MagicMock()
@@ -4942,6 +4932,34 @@ class TestBaxiaViewport:
         assert solver._replay_drag.call_count == 2
 
 
+class TestExtractImagesFromDom:
+    def test_only_requested_layer_is_read(self):
+        import base64
+
+        from wafer.browser._drag import _extract_images_from_dom
+
+        piece = b"\x89PNG piece"
+        page = MagicMock()
+        page.evaluate.return_value = [
+            "data:image/png;base64," + base64.b64encode(piece).decode()
+        ]
+
+        assert _extract_images_from_dom(page, "geetest", ("piece",)) == (
+            None,
+            piece,
+        )
+        _, selectors = page.evaluate.call_args[0]
+        assert selectors == [".geetest_slice_bg"]
+
+    def test_missing_element_returns_nothing(self):
+        from wafer.browser._drag import _extract_images_from_dom
+
+        page = MagicMock()
+        page.evaluate.return_value = None
+
+        assert _extract_images_from_dom(page, "geetest") == (None, None)
+
+
 class TestBrowserSolverThreadOwnership:
     def test_timed_out_worker_clears_readiness_then_next_solve_recovers(
         self,
@@ -6464,6 +6482,7 @@ class TestBrowserSolverFailClosed:
         assert _is_passthrough_challenge_html(html)
 
 
+@pytest.mark.usefixtures("class_without_sleep")
 class TestSolvePerimeterx:
     def _make_solver_with_recordings(self):
         solver = BrowserSolver()
@@ -6500,8 +6519,7 @@ class TestSolvePerimeterx:
         solver._drag_recordings = []
         return solver
 
-    @patch("time.sleep")
-    def test_full_flow_success(self, mock_sleep):
+    def test_full_flow_success(self):
         solver = self._make_solver_with_recordings()
         page = MagicMock()
         page.viewport_size = {"width": 1280, "height": 720}
@@ -6558,8 +6576,7 @@ class TestSolvePerimeterx:
         page.mouse.up.assert_called_once()
         assert page.mouse.move.call_count > 0
 
-    @patch("time.sleep")
-    def test_skips_solve_when_no_challenge(self, mock_sleep):
+    def test_skips_solve_when_no_challenge(self):
         """No PX challenge on page → passive polling, no mouse."""
         solver = self._make_solver_with_recordings()
         page = MagicMock()
@@ -6576,8 +6593,7 @@ class TestSolvePerimeterx:
         assert result is True
         page.mouse.down.assert_not_called()
 
-    @patch("time.sleep")
-    def test_fallback_to_passive_when_no_recordings(self, mock_sleep):
+    def test_fallback_to_passive_when_no_recordings(self):
         solver = BrowserSolver()
         page = MagicMock()
 
@@ -6609,8 +6625,7 @@ class TestSolvePerimeterx:
         assert result is True
         page.mouse.down.assert_not_called()
 
-    @patch("time.sleep")
-    def test_retries_on_failure(self, mock_sleep):
+    def test_retries_on_failure(self):
         solver = self._make_solver_with_recordings()
         page = MagicMock()
         page.viewport_size = {"width": 1280, "height": 720}
@@ -7180,9 +7195,8 @@ class TestImpervaXhrReplay:
 class TestDispatchChallenge:
     def _make_solver_with_mock_browser(self):
         solver = BrowserSolver()
-        solver._browser = MagicMock()
-        solver._browser.is_connected.return_value = True
-        solver._playwright = MagicMock()
+        solver._browser = MockBrowser()
+        solver._playwright = SimpleNamespace()
         solver._browser_ua = "Chrome/145"
         return solver
 
@@ -9861,10 +9875,10 @@ class TestBrowseRecordingLoader:
         assert row["dx"] == pytest.approx(30.0)
         assert row["scroll_y"] == pytest.approx(-100.0)
 
-    def test_browses_optional_not_gating(self, tmp_path):
+    def test_browses_optional_not_gating(self, recordings_dir):
         """Missing browses dir does not prevent _ensure_recordings
         from returning True (browses are optional)."""
-        rec_dir = _setup_recordings_dir(tmp_path)
+        rec_dir = recordings_dir
         # No browses dir created
 
         solver = BrowserSolver()
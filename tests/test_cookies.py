@@ -229,6 +229,54 @@ class TestCookieCacheReadWrite:
         cache.save("e.com", [])
         assert cache.load("e.com") == []
 
+    def test_repeat_load_skips_reparse_until_file_changes(self, tmp_path):
+        cache = CookieCache(cache_dir=str(tmp_path))
+        cookie = {
+            "name": "a",
+            "raw": "a=1",
+            "url": "https://e.com",
+            "expires": _FUTURE,
+        }
+        cache.save("e.com", [dict(cookie)])
+        first = cache.load("e.com")
+
+        with patch("wafer._cookies.json.load") as json_load:
+            second = cache.load("e.com")
+        json_load.assert_not_called()
+        assert [c["raw"] for c in second] == [c["raw"] for c in first]
+        # Callers mutate loaded entries; the parsed copy must not leak
+        second[0]["raw"] = "mutated"
+        assert cache.load("e.com")[0]["raw"] == "a=1"
+
+        cache.save("e.com", [dict(cookie, raw="a=2")])
+        assert cache.load("e.com")[0]["raw"] == "a=2"
+
+    def test_own_rewrite_picked_up_when_stat_unchanged(self, tmp_path):
+        """A same-size save whose stat signature matches is still re-read."""
+        cache = CookieCache(cache_dir=str(tmp_path))
+        cookie = {
+            "name": "a",
+            "raw": "a=1",
+            "url": "https://e.com",
+            "expires": _FUTURE,
+        }
+        cache.save("e.com", [dict(cookie)])
+        path = tmp_path / "e.com.json"
+        pinned = os.stat(path)
+        real_stat = os.stat
+
+        # Coarse timestamps plus a recycled inode: the rewrite below is
+        # indistinguishable from the original by stat alone.
+        def stat_pinned(target, *args, **kwargs):
+            if os.fspath(target) == str(path):
+                return pinned
+            return real_stat(target, *args, **kwargs)
+
+        with patch("wafer._cookies.os.stat", side_effect=stat_pinned):
+            assert cache.load("e.com")[0]["raw"] == "a=1"
+            cache.save("e.com", [dict(cookie, raw="a=2")])
+            assert cache.load("e.com")[0]["raw"] == "a=2"
+
 
 # ---------------------------------------------------------------------------
 # CookieCache: TTL
@@ -59,3 +59,16 @@ class TestMismatchedPair:
             f"Correct pair ({correct_conf:.3f}) should beat "
             f"mismatched pair ({wrong_conf:.3f})"
         )
+
+
+class TestPieceCache:
+    def test_repeat_solve_reuses_piece_and_matches(self):
+        """A retry with the same piece hits the cache and gives the same answer."""
+        from wafer.browser._cv import _piece_features
+
+        bg = (IMAGES / "bg_002.png").read_bytes()
+        piece = (IMAGES / "piece_002.png").read_bytes()
+        first = find_notch(bg, piece)
+        hits = _piece_features.cache_info().hits
+        assert find_notch(bg, piece) == first
+        assert _piece_features.cache_info().hits == hits + 1
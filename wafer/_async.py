@@ -832,6 +832,9 @@ class AsyncSession(BaseSession):
             logger.warning("Browser solve produced no cookies scoped to %s", reg)
             return False
 
+        # Format each cookie once; the disk cache and the jar share the string.
+        raw_cookies = [format_cookie_str(cookie) for cookie in target_cookies]
+
         # Persist browser cookies to disk cache
         if self._cookie_cache and domain and target_cookies:
             cache_domain = (
@@ -839,9 +842,9 @@ class AsyncSession(BaseSession):
                 if challenge == ChallengeType.REDDIT
                 else domain
             )
+            now = time.time()
             cache_entries = []
-            for cookie in target_cookies:
-                raw = format_cookie_str(cookie)
+            for cookie, raw in zip(target_cookies, raw_cookies):
                 expires = cookie.get("expires", -1)
                 cache_entries.append(
                     {
@@ -851,9 +854,9 @@ class AsyncSession(BaseSession):
                         "domain": cookie.get("domain", domain),
                         "path": cookie.get("path", "/"),
                         "expires": (
-                            time.time() + 86400 if expires <= 0 else float(expires)
+                            now + 86400 if expires <= 0 else float(expires)
                         ),
-                        "last_used": time.time(),
+                        "last_used": now,
                     }
                 )
             try:
@@ -920,9 +923,8 @@ class AsyncSession(BaseSession):
             self._rebuild_client()
 
         # Also inject directly into jar (covers cache-disabled case)
-        for cookie in target_cookies:
+        for cookie, raw in zip(target_cookies, raw_cookies):
             try:
-                raw = format_cookie_str(cookie)
                 cookie_domain = cookie.get("domain")
                 self._record_cookie_scope(
                     raw,
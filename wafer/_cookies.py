@@ -175,6 +175,12 @@ class CookieCache:
         self._sweep_lock = threading.Lock()
         self._domain_locks: dict[str, threading.Lock] = {}
         self._lock_lock = threading.Lock()
+        # Parsed file contents keyed by filename, tagged with the file's
+        # (inode, mtime_ns, size). _write_atomic() drops the entry for our
+        # own writes; the stat signature only catches other writers, and
+        # can miss a same-size rewrite within one mtime tick (the rename's
+        # inode can also repeat, as filesystems recycle them).
+        self._parsed: dict[str, tuple[tuple[int, int, int], list[dict]]] = {}
 
     def _domain_path(self, domain: str) -> Path:
         safe = (
@@ -185,10 +191,22 @@ class CookieCache:
         return self._cache_dir / f"{safe}.json"
 
     def _load_raw(self, domain: str) -> list[dict]:
-        """Load entries from disk without TTL filtering."""
+        """Load entries from disk without TTL filtering.
+
+        Unchanged files are served from the parsed copy instead of being
+        re-read; callers get fresh dicts either way, since load() and
+        save() mutate the entries they receive.
+        """
         path = self._domain_path(domain)
-        if not path.exists():
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._parsed.pop(path.name, None)
             return []
+        signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+        cached = self._parsed.get(path.name)
+        if cached is not None and cached[0] == signature:
+            return [dict(entry) for entry in cached[1]]
         try:
             with open(path) as f:
                 data = json.load(f)
@@ -203,7 +221,8 @@ class CookieCache:
                     "Corrupt cookie entries for %s, ignoring invalid values",
                     domain,
                 )
-            return valid
+            self._parsed[path.name] = (signature, valid)
+            return [dict(entry) for entry in valid]
         except (json.JSONDecodeError, OSError) as e:
             logger.warning(
                 "Failed to load cookies for %s: %s", domain, e
@@ -398,6 +417,7 @@ class CookieCache:
                 f.flush()
                 os.fsync(f.fileno())
             os.replace(tmp_path, path)
+            self._parsed.pop(path.name, None)
             if os.name != "nt":
                 dir_flags = os.O_RDONLY
                 if hasattr(os, "O_DIRECTORY"):
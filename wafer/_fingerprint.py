@@ -1,5 +1,6 @@
 """Fingerprint management: profile selection, rotation, pinning, sec-ch-ua."""
 
+import functools
 import logging
 import platform
 import re
@@ -501,18 +502,23 @@ def emulation_family(emulation: Emulation) -> str | None:
     The family is derived from ``repr(emulation)`` (``"Profile.XxxNNN"``)
     since the enum is not hashable and has no ``.name``.
     """
-    m = _FAMILY_RE.match(repr(emulation))
-    if m is None:
-        return None
-    return m.group(1).lower()
+    return _parse_profile_repr(repr(emulation))[0]
 
 
 def emulation_major_version(emulation: Emulation) -> int | None:
     """Extract the major version from any family's Emulation profile, or None."""
-    m = _FAMILY_RE.match(repr(emulation))
+    return _parse_profile_repr(repr(emulation))[1]
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_profile_repr(profile: str) -> tuple[str | None, int | None]:
+    # Emulation is unhashable, but its repr is a plain string: key the
+    # family/version parse on that so header building doesn't re-run the
+    # regex for the same profile on every request.
+    m = _FAMILY_RE.match(profile)
     if m is None:
-        return None
-    return int(m.group(2))
+        return None, None
+    return m.group(1).lower(), int(m.group(2))
 
 
 # Mobile Emulation profiles carry a phone/tablet TLS shape + a mobile UA from
@@ -709,14 +715,23 @@ _UA_CHROME_RE = re.compile(r"Chrome/(\d+)")
 _UA_CHROME_FULL_RE = re.compile(r"Chrome/(\d+\.\d+\.\d+\.\d+)")
 
 
+# A session sees the same few UAs over and over (every browser solve,
+# pin and client-hint build), so the parsed versions are memoized.
+@functools.lru_cache(maxsize=256)
 def chrome_version_from_ua(user_agent: str) -> int | None:
     """Extract Chrome major version from a User-Agent string."""
+    # Substring check first: non-Chrome UAs never reach the regex engine.
+    if "Chrome/" not in user_agent:
+        return None
     m = _UA_CHROME_RE.search(user_agent)
     return int(m.group(1)) if m else None
 
 
+@functools.lru_cache(maxsize=256)
 def chrome_full_version_from_ua(user_agent: str) -> str | None:
     """Extract the full Chrome version (e.g. ``145.0.7632.117``) from a UA."""
+    if "Chrome/" not in user_agent:
+        return None
     m = _UA_CHROME_FULL_RE.search(user_agent)
     return m.group(1) if m else None
 
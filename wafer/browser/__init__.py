@@ -1,5 +1,6 @@
 """Browser-based challenge solving via patchright (patched Playwright)."""
 
+import functools
 from email.utils import formatdate
 
 from wafer.browser._recaptcha_grid import (
@@ -16,6 +17,18 @@ from wafer.browser._solver import (
     scrub_headless_ua,
 )
 
+_SAME_SITE_ATTRS = {
+    "Strict": "SameSite=Strict",
+    "Lax": "SameSite=Lax",
+    "None": "SameSite=None",
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _expires_attr(expires: float) -> str:
+    # Cookies set together share an expiry; format each timestamp once.
+    return f"Expires={formatdate(expires, usegmt=True)}"
+
 
 def format_cookie_str(cookie: dict) -> str:
     """Convert a browser cookie dict to a Set-Cookie header string.
@@ -36,16 +49,16 @@ def format_cookie_str(cookie: dict) -> str:
         parts.append(f"Path={cookie['path']}")
     expires = cookie.get("expires", -1)
     if isinstance(expires, (int, float)) and expires > 0:
-        parts.append(
-            f"Expires={formatdate(expires, usegmt=True)}"
-        )
+        parts.append(_expires_attr(expires))
     if cookie.get("secure"):
         parts.append("Secure")
     if cookie.get("httpOnly"):
         parts.append("HttpOnly")
     same_site = cookie.get("sameSite", "")
-    if same_site and same_site != "":
-        parts.append(f"SameSite={same_site}")
+    if same_site:
+        parts.append(
+            _SAME_SITE_ATTRS.get(same_site) or f"SameSite={same_site}"
+        )
     return "; ".join(parts)
 
 
@@ -11,6 +11,7 @@ textures — halftone dots, circuit-board patterns, photographs, etc.
 Requires ``opencv-python-headless``.
 """
 
+import functools
 import logging
 
 import cv2
@@ -67,10 +68,13 @@ def _prep_piece(
 
 
 def _edge_match(
-    bg_gray: np.ndarray, piece_edges_rgb: np.ndarray, blur: int
+    bg_gray: np.ndarray, piece_edges: np.ndarray, blur: int
 ) -> tuple[int, int, float]:
     """Run edge-based template matching at a given blur level.
 
+    Both edge maps are single-channel: replicating them to RGB gives
+    the same TM_CCOEFF_NORMED score at three times the cost.
+
     Returns ``(x, y, confidence)``.
     """
     if blur > 0:
@@ -78,11 +82,7 @@ def _edge_match(
     else:
         bg_proc = bg_gray
     bg_edges = cv2.Canny(bg_proc, 100, 200)
-    result = cv2.matchTemplate(
-        cv2.cvtColor(bg_edges, cv2.COLOR_GRAY2RGB),
-        piece_edges_rgb,
-        cv2.TM_CCOEFF_NORMED,
-    )
+    result = cv2.matchTemplate(bg_edges, piece_edges, cv2.TM_CCOEFF_NORMED)
     _, max_val, _, max_loc = cv2.minMaxLoc(result)
     return max_loc[0], max_loc[1], float(max_val)
 
@@ -99,11 +99,13 @@ def _hsv_match(
     By matching in HS space, the darkening becomes invisible — the
     piece colors match the notch colors regardless of the overlay.
     """
-    bg_hsv = cv2.cvtColor(bg_bgr, cv2.COLOR_BGR2HSV).astype(np.float32)
-    piece_hsv = cv2.cvtColor(piece_bgr, cv2.COLOR_BGR2HSV).astype(np.float32)
+    # Stays uint8: matchTemplate accumulates in float internally, so a
+    # float32 copy of both images only quadruples the bytes scanned.
+    bg_hsv = cv2.cvtColor(bg_bgr, cv2.COLOR_BGR2HSV)
+    piece_hsv = cv2.cvtColor(piece_bgr, cv2.COLOR_BGR2HSV)
     # H and S channels only (drop V which carries the darkening)
-    bg_hs = bg_hsv[:, :, :2]
-    piece_hs = piece_hsv[:, :, :2]
+    bg_hs = np.ascontiguousarray(bg_hsv[:, :, :2])
+    piece_hs = np.ascontiguousarray(piece_hsv[:, :, :2])
     mask_u8 = piece_mask.astype(np.uint8) * 255
     mask_2ch = np.stack([mask_u8, mask_u8], axis=2)
     result = cv2.matchTemplate(
@@ -180,7 +182,7 @@ def _contrast_score(
     y0 = max(y - pad, 0)
     x1 = min(x + pw + pad, bw)
     y1 = min(y + ph + pad, bh)
-    context = bg_gray[y0:y1, x0:x1].astype(np.float64)
+    context = bg_gray[y0:y1, x0:x1].astype(np.float32)
 
     # Local average: heavily blurred version represents "what the
     # area would look like without the notch shadow"
@@ -208,6 +210,34 @@ def _contrast_score(
     return float(intersection / union)
 
 
+@functools.lru_cache(maxsize=32)
+def _piece_features(
+    piece_png: bytes,
+) -> tuple[np.ndarray, np.ndarray, int, np.ndarray, float]:
+    """Decode and prepare a piece once per distinct PNG.
+
+    Retries against the same puzzle resend the same piece, so its crop,
+    dilated edge map and mean saturation are memoized.  Returns
+    ``(piece_rgb, piece_mask, x0_crop, piece_edges, mean_sat)``; the
+    arrays are shared between calls and marked read-only.
+    """
+    piece = cv2.imdecode(
+        np.frombuffer(piece_png, np.uint8), cv2.IMREAD_UNCHANGED
+    )
+    piece_rgb, piece_mask, x0_crop = _prep_piece(piece)
+
+    piece_gray = cv2.cvtColor(piece_rgb, cv2.COLOR_BGR2GRAY)
+    piece_edges = cv2.Canny(piece_gray, 100, 200)
+    piece_edges = cv2.dilate(piece_edges, _DILATE_KERNEL, iterations=1)
+
+    piece_hsv = cv2.cvtColor(piece_rgb, cv2.COLOR_BGR2HSV)
+    mean_sat = float(np.mean(piece_hsv[:, :, 1][piece_mask]))
+
+    for arr in (piece_rgb, piece_mask, piece_edges):
+        arr.setflags(write=False)
+    return piece_rgb, piece_mask, x0_crop, piece_edges, mean_sat
+
+
 def find_notch(bg_png: bytes, piece_png: bytes) -> tuple[int, float]:
     """Find the X pixel offset where *piece* fits into *bg*.
 
@@ -232,23 +262,16 @@ def find_notch(bg_png: bytes, piece_png: bytes) -> tuple[int, float]:
         *confidence* is the normalized correlation score (0.0–1.0).
     """
     bg = cv2.imdecode(np.frombuffer(bg_png, np.uint8), cv2.IMREAD_COLOR)
-    piece = cv2.imdecode(
-        np.frombuffer(piece_png, np.uint8), cv2.IMREAD_UNCHANGED
+    piece_rgb, piece_mask, x0_crop, piece_edges, mean_sat = (
+        _piece_features(piece_png)
     )
 
-    piece_rgb, piece_mask, x0_crop = _prep_piece(piece)
-
     bg_gray = cv2.cvtColor(bg, cv2.COLOR_BGR2GRAY)
 
-    piece_gray = cv2.cvtColor(piece_rgb, cv2.COLOR_BGR2GRAY)
-    piece_edges = cv2.Canny(piece_gray, 100, 200)
-    piece_edges = cv2.dilate(piece_edges, _DILATE_KERNEL, iterations=1)
-    piece_edges_rgb = cv2.cvtColor(piece_edges, cv2.COLOR_GRAY2RGB)
-
     # ── Multi-blur edge voting ─────────────────────────────────────
     candidates: list[tuple[int, int, float]] = []
     for blur in _BLUR_LEVELS:
-        x, y, conf = _edge_match(bg_gray, piece_edges_rgb, blur)
+        x, y, conf = _edge_match(bg_gray, piece_edges, blur)
         candidates.append((x, y, conf))
         logger.debug("CV edge blur=%d: x=%d y=%d conf=%.3f", blur, x, y, conf)
 
@@ -256,8 +279,6 @@ def find_notch(bg_png: bytes, piece_png: bytes) -> tuple[int, float]:
     # Matches piece hue+saturation against bg, ignoring the darkening
     # overlay.  Adds one vote that's independent of edge detection.
     # Skip for B&W / grayscale puzzles — no hue signal to match.
-    piece_hsv_check = cv2.cvtColor(piece_rgb, cv2.COLOR_BGR2HSV)
-    mean_sat = float(np.mean(piece_hsv_check[:, :, 1][piece_mask]))
     if mean_sat > 15:
         hsv_x, hsv_y, hsv_conf = _hsv_match(bg, piece_rgb, piece_mask)
         candidates.append((hsv_x, hsv_y, hsv_conf))
@@ -91,11 +91,15 @@ def setup_image_intercept(page, vendor: str) -> dict:
     domains = _image_domains(vendor)
     if not domains:
         return captured
+    # Built once per intercept: one set lookup + one C-level
+    # endswith(tuple) per response instead of a generator over domains.
+    exact_domains = frozenset(domains)
+    dot_domains = tuple("." + d for d in domains)
 
     def _on_response(response):
         try:
             host = urlparse(response.url).hostname or ""
-            if not any(host == d or host.endswith("." + d) for d in domains):
+            if host not in exact_domains and not host.endswith(dot_domains):
                 return
             ct = response.headers.get("content-type", "")
             if "image/png" not in ct and not response.url.endswith(".png"):
@@ -119,34 +123,40 @@ def setup_image_intercept(page, vendor: str) -> dict:
     return captured
 
 
-def _extract_images_from_dom(page, vendor: str) -> tuple[bytes | None, bytes | None]:
+def _extract_images_from_dom(
+    page,
+    vendor: str,
+    layers: tuple[str, ...] = ("bg", "piece"),
+) -> tuple[bytes | None, bytes | None]:
     """Extract puzzle images from DOM computed styles.
 
     Fallback when network intercept didn't capture images (e.g. they
     were already loaded before the listener was attached).  Fetches via
     ``page.evaluate`` using the browser's fetch API (no CORS issues for
     data URLs; CDN URLs may fail cross-origin).
+
+    *layers* names the images to extract (``"bg"``, ``"piece"``); the
+    other slot is returned as None.  Pass only what the intercept missed
+    so an already-captured background isn't shipped over CDP again.
     """
     if vendor == "geetest":
-        bg_sel, piece_sel = _GT["bg"], _GT["piece"]
+        selectors = {"bg": _GT["bg"], "piece": _GT["piece"]}
     else:
         return None, None
 
     result = page.evaluate(
-        """([bgSel, pieceSel]) => {
-        const bg = document.querySelector(bgSel);
-        const piece = document.querySelector(pieceSel);
-        if (!bg || !piece) return null;
-        const bgUrl = getComputedStyle(bg).backgroundImage;
-        const pieceUrl = getComputedStyle(piece).backgroundImage;
-        if (!bgUrl || bgUrl === 'none') return null;
-        if (!pieceUrl || pieceUrl === 'none') return null;
-        return {
-            bg: bgUrl.slice(5, -2),
-            piece: pieceUrl.slice(5, -2),
-        };
+        """(sels) => {
+        const urls = [];
+        for (const sel of sels) {
+            const el = document.querySelector(sel);
+            if (!el) return null;
+            const url = getComputedStyle(el).backgroundImage;
+            if (!url || url === 'none') return null;
+            urls.push(url.slice(5, -2));
+        }
+        return urls;
     }""",
-        [bg_sel, piece_sel],
+        [selectors[key] for key in layers],
     )
     if not result:
         return None, None
@@ -154,8 +164,7 @@ def _extract_images_from_dom(page, vendor: str) -> tuple[bytes | None, bytes | N
     import base64
 
     images: dict[str, bytes | None] = {"bg": None, "piece": None}
-    for key in ("bg", "piece"):
-        url = result[key]
+    for key, url in zip(layers, result):
         if url.startswith("data:"):
             _, encoded = url.split(",", 1)
             images[key] = base64.b64decode(encoded)
@@ -298,7 +307,10 @@ def solve_drag(solver, page, timeout_ms: int) -> bool:
     # Fallback: extract from DOM if intercept missed them
     if not bg_png or not piece_png:
         logger.debug("Network intercept incomplete, trying DOM extraction")
-        bg_dom, piece_dom = _extract_images_from_dom(page, vendor)
+        missing = tuple(
+            key for key, png in (("bg", bg_png), ("piece", piece_png)) if not png
+        )
+        bg_dom, piece_dom = _extract_images_from_dom(page, vendor, missing)
         bg_png = bg_png or bg_dom
         piece_png = piece_png or piece_dom
 
@@ -22,7 +22,7 @@ WAF-specific logic lives in dedicated modules:
 import asyncio
 import csv
 import importlib.resources
-import io
+import importlib.util
 import ipaddress
 import logging
 import math
@@ -43,7 +43,11 @@ from concurrent.futures import (
 from dataclasses import dataclass, field
 from urllib.parse import unquote, urlparse
 
-from wafer._cookies import browser_cookie_matches_host, registrable_domain
+from wafer._cookies import (
+    browser_cookie_matches_host,
+    cookie_domain_matches,
+    registrable_domain,
+)
 from wafer._errors import ResponseTooLarge
 from wafer._fingerprint import chrome_full_version
 
@@ -1049,7 +1053,11 @@ _DIRECTION_ANGLES: dict[str, float] = {
 
 
 def _parse_metadata(line: str) -> dict[str, str]:
-    """Parse a ``# key=val key=val`` metadata comment line."""
+    """Parse a ``# key=val key=val`` metadata comment line.
+
+    Only a recording's first line is metadata, so callers ``partition`` it
+    off instead of ``splitlines()``-ing the whole file.
+    """
     meta: dict[str, str] = {}
     if not line.startswith("#"):
         return meta
@@ -1062,12 +1070,17 @@ def _parse_metadata(line: str) -> dict[str, str]:
 
 def _parse_csv_rows(text: str, fields: tuple[str, ...]) -> list[dict[str, float]]:
     """Parse CSV text (skipping ``#`` comment lines) into a list of dicts."""
-    clean = "\n".join(line for line in text.splitlines() if not line.startswith("#"))
-    rows: list[dict[str, float]] = []
-    reader = csv.DictReader(io.StringIO(clean))
-    for row in reader:
-        rows.append({f: float(row[f]) for f in fields})
-    return rows
+    reader = csv.reader(
+        line for line in text.splitlines() if not line.startswith("#")
+    )
+    header = next(reader, None)
+    if header is None:
+        return []
+    # Resolve column positions once; DictReader would build a dict per row
+    column = {name: i for i, name in enumerate(header)}
+    return [
+        {f: float(row[column[f]]) for f in fields} for row in reader if row
+    ]
 
 
 def _angle_from_metadata(meta: dict[str, str]) -> float:
@@ -1239,7 +1252,7 @@ class _BrowseState:
     current_y: float
 
 
-@dataclass
+@dataclass(slots=True)
 class CapturedResponse:
     """An HTTP response captured during interception or passthrough.
 
@@ -1247,6 +1260,9 @@ class CapturedResponse:
     preserves the individual ``Set-Cookie`` values, which the flat dict would
     collapse (a response can carry several Set-Cookie headers and they must
     stay separate to round-trip into the wreq jar).
+
+    ``full_length`` is the original body size when ``body`` was truncated to
+    an intercept's ``max_body_size``; ``None`` means ``body`` is complete.
     """
 
     url: str
@@ -1254,9 +1270,10 @@ class CapturedResponse:
     headers: dict[str, str]
     body: bytes
     set_cookie: list[str] = field(default_factory=list)
+    full_length: int | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SolveResult:
     """Result of browser-based challenge solving."""
 
@@ -1276,7 +1293,7 @@ class SolveResult:
     challenge_absent: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class InterceptResult:
     """Result of iframe interception.
 
@@ -1310,13 +1327,14 @@ class BrowserSolver:
         egress_guard_proxy: str | None = None,
         executable_path: str | os.PathLike[str] | None = None,
     ):
-        try:
-            import patchright  # noqa: F401
-        except ImportError:
+        # Presence check only: patchright itself loads on first browser
+        # launch (_ensure_browser), so constructing a solver that never
+        # solves doesn't pay for the Playwright import.
+        if importlib.util.find_spec("patchright") is None:
             raise ImportError(
                 "BrowserSolver requires the [browser] extra. "
                 "Install it with: pip install wafer-py[browser]"
-            ) from None
+            )
         self._headless = headless
         self._idle_timeout = idle_timeout
         self._solve_timeout = solve_timeout
@@ -2248,7 +2266,7 @@ class BrowserSolver:
                 if not name.endswith(".csv"):
                     continue
                 text = f.read_text()
-                meta = _parse_metadata(text.splitlines()[0])
+                meta = _parse_metadata(text.partition("\n")[0])
                 angle = _angle_from_metadata(meta)
                 rows = _parse_csv_rows(text, ("t", "rx", "ry"))
                 if rows:
@@ -2283,7 +2301,7 @@ class BrowserSolver:
                 if not name.endswith(".csv"):
                     continue
                 text = f.read_text()
-                meta = _parse_metadata(text.splitlines()[0])
+                meta = _parse_metadata(text.partition("\n")[0])
                 rows = _parse_csv_rows(text, ("t", "rx", "ry"))
                 if rows:
                     self._drag_recordings.append(
@@ -2299,7 +2317,7 @@ class BrowserSolver:
                 if not name.endswith(".csv"):
                     continue
                 text = f.read_text()
-                meta = _parse_metadata(text.splitlines()[0])
+                meta = _parse_metadata(text.partition("\n")[0])
                 rows = _parse_csv_rows(text, ("t", "rx", "ry"))
                 if rows:
                     self._slide_recordings.append(
@@ -2315,7 +2333,7 @@ class BrowserSolver:
                 if not name.endswith(".csv"):
                     continue
                 text = f.read_text()
-                meta = _parse_metadata(text.splitlines()[0])
+                meta = _parse_metadata(text.partition("\n")[0])
                 rows = _parse_csv_rows(text, ("t", "dx", "dy", "scroll_y"))
                 if rows:
                     self._browse_recordings.append(
@@ -2336,7 +2354,7 @@ class BrowserSolver:
                 if not name.endswith(".csv"):
                     continue
                 text = f.read_text()
-                meta = _parse_metadata(text.splitlines()[0])
+                meta = _parse_metadata(text.partition("\n")[0])
                 angle = _angle_from_metadata(meta)
                 rows = _parse_csv_rows(text, ("t", "rx", "ry"))
                 if rows:
@@ -4129,6 +4147,7 @@ class BrowserSolver:
         embedder_url: str,
         target_domain: str,
         timeout: float | None = None,
+        max_body_size: int | None = None,
     ) -> InterceptResult | None:
         """Intercept iframe traffic within one end-to-end deadline."""
 
@@ -4149,6 +4168,7 @@ class BrowserSolver:
                 embedder_url,
                 target_domain,
                 timeout,
+                max_body_size,
             )
         intercept_timeout = self._solve_timeout if timeout is None else timeout
         if intercept_timeout <= 0:
@@ -4159,6 +4179,7 @@ class BrowserSolver:
             embedder_url,
             target_domain,
             intercept_timeout,
+            max_body_size,
             _deadline=deadline,
         )
         try:
@@ -4185,6 +4206,7 @@ class BrowserSolver:
         embedder_url: str,
         target_domain: str,
         timeout: float | None = None,
+        max_body_size: int | None = None,
         *,
         _deadline: float | None = None,
     ) -> InterceptResult | None:
@@ -4200,6 +4222,10 @@ class BrowserSolver:
                 subdomain (e.g., "marinetraffic.com" matches
                 "www.marinetraffic.com").
             timeout: Max seconds to wait. Defaults to ``solve_timeout``.
+            max_body_size: Keep at most this many bytes of each captured
+                body, recording the original size in ``full_length``, so a
+                tile-heavy embedder can't hold every download in memory.
+                ``None`` keeps bodies whole.
 
         Returns:
             InterceptResult with cookies and captured responses, or
@@ -4248,16 +4274,15 @@ class BrowserSolver:
                     self._publish_browser_identity()
 
                 captured: list[CapturedResponse] = []
+                target_suffix = "." + target_domain
 
                 def _on_response(response):
                     try:
                         url = response.url
                         # Match target domain (including subdomains)
-                        from urllib.parse import urlparse
-
                         host = urlparse(url).hostname or ""
                         if not (
-                            host == target_domain or host.endswith("." + target_domain)
+                            host == target_domain or host.endswith(target_suffix)
                         ):
                             return
                         # Read body — may fail for redirects/empty
@@ -4265,6 +4290,10 @@ class BrowserSolver:
                             body = response.body()
                         except Exception:
                             body = b""
+                        full_length = None
+                        if max_body_size is not None and len(body) > max_body_size:
+                            full_length = len(body)
+                            body = body[:max_body_size]
                         headers = {}
                         try:
                             for k, v in response.headers.items():
@@ -4277,6 +4306,7 @@ class BrowserSolver:
                                 status=response.status,
                                 headers=headers,
                                 body=body,
+                                full_length=full_length,
                             )
                         )
                     except Exception:
@@ -4335,14 +4365,7 @@ class BrowserSolver:
                 target_cookies = [
                     c
                     for c in all_cookies
-                    if (
-                        c.get("domain", "").lstrip(".").rstrip(".").lower()
-                        == target_domain
-                        or c.get("domain", "")
-                        .rstrip(".")
-                        .lower()
-                        .endswith("." + target_domain)
-                    )
+                    if cookie_domain_matches(c.get("domain", ""), target_domain)
                 ]
 
                 self._last_used = time.monotonic()
@@ -4532,6 +4555,7 @@ class BrowserSolver:
         embedder_url: str,
         target_domain: str,
         timeout: float | None = None,
+        max_body_size: int | None = None,
     ) -> "InterceptResult | None":
         """Async wrapper around :meth:`intercept_iframe` - same args/result.
 
@@ -4557,12 +4581,25 @@ class BrowserSolver:
                     embedder_url,
                     target_domain,
                     intercept_timeout,
+                    max_body_size,
                     _deadline=deadline,
                 )
+            from wafer._base import _callable_accepts_keyword
+
+            if max_body_size is None or not _callable_accepts_keyword(
+                intercept_callable,
+                "max_body_size",
+            ):
+                return intercept_callable(
+                    embedder_url,
+                    target_domain,
+                    intercept_timeout,
+                )
             return intercept_callable(
                 embedder_url,
                 target_domain,
                 intercept_timeout,
+                max_body_size=max_body_size,
             )
 
         future = self._submit_on_worker(invoke_intercept)